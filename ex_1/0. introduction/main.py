@@ -1,7 +1,18 @@
 from __future__ import annotations
 
+import heapq
+import json
+import mmap
+import os
+import re
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, asdict
-from typing import List, Optional
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 
 from flask import Flask, render_template, request, url_for, redirect, abort
 
@@ -9,8 +20,13 @@ from flask import Flask, render_template, request, url_for, redirect, abort
 app = Flask(__name__)
 
 
-@dataclass
+@dataclass(frozen=True)
 class Video:
+    __slots__ = (
+        "id", "title", "channel", "views", "published",
+        "duration", "description", "thumbnail_url", "video_url",
+    )
+
     id: str
     title: str
     channel: str
@@ -99,41 +115,527 @@ def generate_sample_videos() -> List[Video]:
     return sample
 
 
-VIDEOS: List[Video] = generate_sample_videos()
-VIDEO_INDEX = {v.id: v for v in VIDEOS}
+# Catalog backends. Every backend addresses records by an integer offset (a list
+# position, a byte offset into the file, or a SQLite rowid) and loads a Video only
+# when it is needed, so a large catalog never sits in memory as objects.
+TEMPLATE_CACHE_SIZE = 4096
+JSON_TOKEN_RE = re.compile(rb'"(?:[^"\\]|\\.)*"|[\[\]{}]')
+
+
+def video_from_record(record: dict, category: Optional[str] = None) -> Video:
+    """Build a Video from a catalog record, filling fields the record lacks.
+
+    Records in the ex_page_1/videos.json format only have a YouTube ``id`` and
+    ``title``; the category they are listed under is used as the channel. Without a
+    ``video_url`` the watch page embeds the YouTube player for the id instead.
+    """
+    video_id = str(record["id"])
+    return Video(
+        id=video_id,
+        title=record.get("title", ""),
+        channel=record.get("channel") or category or "",
+        views=int(record.get("views") or 0),
+        published=record.get("published", ""),
+        duration=record.get("duration", ""),
+        description=record.get("description", ""),
+        thumbnail_url=record.get("thumbnail_url")
+        or f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg",
+        video_url=record.get("video_url") or "",
+    )
+
+
+class Catalog(ABC):
+    """Ordered video catalog addressed by backend-specific offsets.
+
+    ``offsets`` holds record offsets in catalog order and ``index`` maps video id to
+    offset. Subclasses implement ``load`` for a single record and may override
+    ``iter_videos`` with a sequential scan.
+    """
+
+    def __init__(self) -> None:
+        self.offsets = array("Q")
+        self.index: Dict[str, int] = {}
+        self.template = lru_cache(maxsize=TEMPLATE_CACHE_SIZE)(self._template)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def _add(self, video_id: str, offset: int) -> None:
+        # Records without an id are skipped and the first record wins for duplicates
+        if video_id and video_id not in self.index:
+            self.index[video_id] = offset
+            self.offsets.append(offset)
+
+    @abstractmethod
+    def load(self, offset: int) -> Video:
+        ...
+
+    def _template(self, offset: int) -> dict:
+        return self.load(offset).to_template()
+
+    def iter_videos(self) -> Iterator[Video]:
+        for offset in self.offsets:
+            yield self.load(offset)
+
+
+class MemoryCatalog(Catalog):
+    def __init__(self, videos: Sequence[Video]) -> None:
+        super().__init__()
+        self.videos = list(videos)
+        for position, video in enumerate(self.videos):
+            self._add(video.id, position)
+        # Small catalogs keep every template dict precomputed
+        self.templates = [video.to_template() for video in self.videos]
+        self.template = self.templates.__getitem__
+
+    def load(self, offset: int) -> Video:
+        return self.videos[offset]
+
+
+class JsonlCatalog(Catalog):
+    """One JSON record per line, memory-mapped; offsets are line start positions."""
+
+    def __init__(self, path: str) -> None:
+        super().__init__()
+        with open(path, "rb") as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        for offset, record in self._scan():
+            self._add(str(record.get("id", "")), offset)
+
+    def _scan(self) -> Iterator[Tuple[int, dict]]:
+        offset = 0
+        size = len(self.buffer)
+        while offset < size:
+            end = self.buffer.find(b"\n", offset)
+            if end == -1:
+                end = size
+            line = self.buffer[offset:end].strip()
+            if line:
+                yield offset, json.loads(line)
+            offset = end + 1
+
+    def load(self, offset: int) -> Video:
+        end = self.buffer.find(b"\n", offset)
+        return video_from_record(json.loads(self.buffer[offset:end if end != -1 else None]))
+
+    def iter_videos(self) -> Iterator[Video]:
+        for offset, record in self._scan():
+            if self.index.get(str(record.get("id", ""))) == offset:
+                yield video_from_record(record)
+
+
+class JsonCatalog(Catalog):
+    """A JSON list of records, or a dict of category -> list like ex_page_1/videos.json.
+
+    The memory-mapped file is scanned with a tokenizer that only tracks strings and
+    brackets, so records are located without decoding the whole document; offsets
+    are the byte positions of each record's opening brace.
+    """
+
+    def __init__(self, path: str) -> None:
+        super().__init__()
+        with open(path, "rb") as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        # Offsets where the category changes, for looking up a record's category
+        self.category_offsets: List[int] = []
+        self.category_names: List[Optional[str]] = []
+        for offset, record, category in self._scan():
+            if not self.category_names or self.category_names[-1] != category:
+                self.category_offsets.append(offset)
+                self.category_names.append(category)
+            self._add(str(record.get("id", "")), offset)
+
+    def _scan(self) -> Iterator[Tuple[int, dict, Optional[str]]]:
+        stack: List[bytes] = []
+        last_string = b'""'
+        category: Optional[str] = None
+        record_start = -1
+        for match in JSON_TOKEN_RE.finditer(self.buffer):
+            token = match.group()
+            if token[:1] == b'"':
+                last_string = token
+            elif token in (b"[", b"{"):
+                if token == b"[" and stack == [b"{"]:
+                    category = json.loads(last_string)
+                elif record_start == -1 and token == b"{" and stack and stack[-1] == b"[":
+                    record_start = match.start()
+                    record_depth = len(stack)
+                stack.append(token)
+            else:
+                stack.pop()
+                if record_start != -1 and len(stack) == record_depth:
+                    yield record_start, json.loads(self.buffer[record_start:match.end()]), category
+                    record_start = -1
+
+    def _record_end(self, offset: int) -> int:
+        depth = 0
+        for match in JSON_TOKEN_RE.finditer(self.buffer, offset):
+            token = match.group()
+            if token in (b"[", b"{"):
+                depth += 1
+            elif token in (b"]", b"}"):
+                depth -= 1
+                if depth == 0:
+                    return match.end()
+        raise ValueError(f"unterminated JSON record at byte {offset}")
+
+    def load(self, offset: int) -> Video:
+        record = json.loads(self.buffer[offset:self._record_end(offset)])
+        position = bisect_right(self.category_offsets, offset) - 1
+        return video_from_record(record, self.category_names[position] if position >= 0 else None)
+
+    def iter_videos(self) -> Iterator[Video]:
+        for offset, record, category in self._scan():
+            if self.index.get(str(record.get("id", ""))) == offset:
+                yield video_from_record(record, category)
+
+
+class SqliteCatalog(Catalog):
+    """A ``videos`` table with Video columns; offsets are rowids.
+
+    One connection is shared by the request threads behind a lock.
+    """
+
+    def __init__(self, path: str, table: str = "videos") -> None:
+        super().__init__()
+        self.path = path
+        self.table = table
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.lock = threading.Lock()
+        for rowid, video_id in self.connection.execute(
+            f"SELECT rowid, id FROM {table} ORDER BY rowid"
+        ):
+            self._add(str(video_id or ""), rowid)
+
+    def load(self, offset: int) -> Video:
+        with self.lock:
+            row = self.connection.execute(
+                f"SELECT * FROM {self.table} WHERE rowid = ?", (offset,)
+            ).fetchone()
+        return video_from_record(dict(row))
+
+    def iter_videos(self) -> Iterator[Video]:
+        # A separate connection so a long scan doesn't hold the request lock
+        connection = sqlite3.connect(self.path)
+        connection.row_factory = sqlite3.Row
+        try:
+            for row in connection.execute(f"SELECT rowid AS _rowid, * FROM {self.table} ORDER BY rowid"):
+                record = dict(row)
+                if self.index.get(str(record.get("id") or "")) == record["_rowid"]:
+                    yield video_from_record(record)
+        finally:
+            connection.close()
+
+
+# Catalog file extension -> loader; register more backends here
+CATALOG_LOADERS = {
+    ".json": JsonCatalog,
+    ".jsonl": JsonlCatalog,
+    ".db": SqliteCatalog,
+    ".sqlite": SqliteCatalog,
+    ".sqlite3": SqliteCatalog,
+}
+
+
+def load_catalog(path: Optional[str] = None) -> Catalog:
+    """Open the catalog file at ``path``, or the built-in sample videos when unset."""
+    if not path:
+        return MemoryCatalog(generate_sample_videos())
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in CATALOG_LOADERS:
+        raise ValueError(f"unsupported catalog format: {path}")
+    return CATALOG_LOADERS[extension](path)
+
+
+TOKEN_RE = re.compile(r"\w+")
+# Field bits stored in the low bits of each posting, with their ranking weights
+FIELD_BITS = (("title", 4), ("channel", 2), ("description", 1))
+FIELD_WEIGHTS = {4: 3.0, 2: 2.0, 1: 1.0}
+MASK_SCORES = [
+    sum(weight for bit, weight in FIELD_WEIGHTS.items() if mask & bit) for mask in range(8)
+]
+# A query token that is only a prefix of the indexed term scores less than an exact match
+PREFIX_FACTOR = 0.5
+# Short prefixes can expand to thousands of terms; only the most frequent ones are scanned
+MAX_EXPANSIONS = 50
+# Postings sort by score tier (0 = best mask score) and then by views rank, which sits
+# between the tier and the mask bits
+MASK_TIERS = [sorted(set(MASK_SCORES), reverse=True).index(score) for score in MASK_SCORES]
+RANK_BITS = 40
+RANK_MASK = (1 << RANK_BITS) - 1
+# Looking one doc up in a term costs about as much as scanning this many of its postings
+LOOKUP_COST = 16
+# Once a query has enough results, the rarest token is not read deeper than this per term
+# even if an unread posting could still rank higher (only combinations of common words)
+MAX_SCAN_DEPTH = 4096
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+class SearchIndex:
+    """Inverted index over video titles, channels and descriptions.
+
+    Docs are ranks in views order (most viewed first) and ``docs`` maps them back to
+    catalog positions. Each term maps to a sorted ``array`` of postings
+    ``(tier << RANK_BITS | doc) << 3 | field_mask``, so a term lists its best field
+    matches first and, within a tier, its most viewed videos first. The sorted term list
+    allows prefix lookups with ``bisect``. A query matches videos containing every query
+    token as a term prefix (expanded to at most ``MAX_EXPANSIONS`` of the most frequent
+    terms); results are ranked by field weights (exact terms above prefixes), then by
+    views. The catalog is streamed once while building so no Video objects are kept.
+
+    With a ``limit``, the rarest token is read from the front of its terms in rounds that
+    double in depth, and every other token is looked up only for those candidates. The
+    scan stops reading a term once ``limit`` videos match and the last of them outranks
+    anything its unread postings could reach, so the results are the same as a full scan
+    without touching the tail of common terms. Only queries combining very common words hit
+    ``MAX_SCAN_DEPTH`` first and rank the best of what was read.
+    """
+
+    def __init__(self, catalog: Catalog) -> None:
+        self.catalog = catalog
+        views = array("Q")
+        self.postings: Dict[str, array] = {}
+        for doc, video in enumerate(catalog.iter_videos()):
+            views.append(max(video.views, 0))
+            masks: Dict[str, int] = {}
+            for field, bit in FIELD_BITS:
+                for token in tokenize(getattr(video, field)):
+                    masks[token] = masks.get(token, 0) | bit
+            for token, mask in masks.items():
+                postings = self.postings.get(token)
+                if postings is None:
+                    postings = self.postings[token] = array("Q")
+                postings.append(doc << 3 | mask)
+
+        # Renumber docs by views and store every term in ranking order
+        self.docs = array("Q", sorted(range(len(views)), key=views.__getitem__, reverse=True))
+        ranks = array("Q", bytes(8 * len(views)))
+        for rank, doc in enumerate(self.docs):
+            ranks[doc] = rank
+        for term, postings in self.postings.items():
+            self.postings[term] = array("Q", sorted(
+                (MASK_TIERS[posting & 7] << RANK_BITS | ranks[posting >> 3]) << 3 | posting & 7
+                for posting in postings
+            ))
+        self.terms = sorted(self.postings)
+
+    def _expand(self, prefix: str) -> List[str]:
+        start = bisect_left(self.terms, prefix)
+        end = bisect_left(self.terms, prefix + "\U0010ffff", start)
+        terms = self.terms[start:end]
+        if len(terms) > MAX_EXPANSIONS:
+            terms = heapq.nlargest(MAX_EXPANSIONS, terms, key=lambda term: len(self.postings[term]))
+            if prefix in self.postings and prefix not in terms:
+                terms.append(prefix)
+        return terms
+
+    @staticmethod
+    def _tier_runs(postings: array) -> List[Tuple[int, int, int]]:
+        # (tier, first index, end index) of every tier present in a term
+        runs = []
+        index = 0
+        while index < len(postings):
+            tier = postings[index] >> RANK_BITS + 3
+            end = bisect_left(postings, (tier + 1) << RANK_BITS + 3, index)
+            runs.append((tier, index, end))
+            index = end
+        return runs
+
+    @staticmethod
+    def _lookup(postings: array, runs: List[Tuple[int, int, int]], doc: int) -> int:
+        # A doc appears once per term, inside the run of its tier
+        for tier, low, high in runs:
+            key = (tier << RANK_BITS | doc) << 3
+            index = bisect_left(postings, key, low, high)
+            if index < high and postings[index] >> 3 == key >> 3:
+                return postings[index] & 7
+        return 0
+
+    def _frontier(
+        self, prefix: str, terms: List[str], depth: int = 0, bonus: float = 0.0
+    ) -> Tuple[float, int]:
+        # Postings are in tier order, so the one at ``depth`` is the best one left. Returns
+        # the best rank key it could reach with ``bonus`` added from the other tokens
+        best = (0.0, -RANK_MASK)
+        for term in terms:
+            postings = self.postings[term]
+            if len(postings) > depth:
+                factor = 1.0 if term == prefix else PREFIX_FACTOR
+                posting = postings[depth]
+                score = MASK_SCORES[posting & 7] * factor + bonus
+                best = max(best, (score, -(posting >> 3 & RANK_MASK)))
+        return best
+
+    def _match(
+        self,
+        prefix: str,
+        terms: List[str],
+        start: int = 0,
+        stop: Optional[int] = None,
+        docs: Optional[Dict[int, float]] = None,
+    ) -> Dict[int, float]:
+        matches: Dict[int, float] = {}
+        for term in terms:
+            factor = 1.0 if term == prefix else PREFIX_FACTOR
+            postings = self.postings[term]
+            if docs is not None and len(docs) * LOOKUP_COST < len(postings):
+                # Few candidates left: look each one up instead of scanning the term
+                runs = self._tier_runs(postings)
+                hits = [(doc, self._lookup(postings, runs, doc)) for doc in docs]
+            else:
+                if start or stop is not None:
+                    postings = postings[start:stop]
+                hits = [(posting >> 3 & RANK_MASK, posting & 7) for posting in postings]
+            for doc, mask in hits:
+                if docs is not None and doc not in docs:
+                    continue
+                score = MASK_SCORES[mask] * factor
+                if score > matches.get(doc, 0.0):
+                    matches[doc] = score
+        return matches
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Video]:
+        catalog = self.catalog
+        return [catalog.load(catalog.offsets[doc]) for doc in self.search_docs(query, limit)]
+
+    def search_docs(self, query: str, limit: Optional[int] = None) -> List[int]:
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens or limit == 0:
+            return []
+
+        # Intersect from the rarest token so later steps only touch surviving docs
+        expanded = sorted(
+            ((token, self._expand(token)) for token in tokens),
+            key=lambda item: sum(len(self.postings[term]) for term in item[1]),
+        )
+        (first, first_terms), rest = expanded[0], expanded[1:]
+        if not first_terms:
+            return []
+        rest_best = sum(self._frontier(token, terms)[0] for token, terms in rest)
+
+        scores: Dict[int, float] = {}
+
+        def rank_key(doc: int):
+            return scores[doc], -doc
+
+        # Tokens that became cheaper to scan than to look up, matched once for all rounds
+        scanned: Dict[str, Dict[int, float]] = {}
+        start, stop = 0, limit
+        reading = first_terms
+        while True:
+            found = self._match(first, reading, start, stop)
+            for token, terms in rest:
+                if not found:
+                    break
+                matches = scanned.get(token)
+                if matches is None:
+                    size = sum(len(self.postings[term]) for term in terms)
+                    if len(found) * LOOKUP_COST < size:
+                        matches = self._match(token, terms, docs=found)
+                    else:
+                        matches = scanned[token] = self._match(token, terms)
+                found = {doc: score + matches[doc] for doc, score in found.items() if doc in matches}
+            for doc, score in found.items():
+                if score > scores.get(doc, 0.0):
+                    scores[doc] = score
+            if stop is None:
+                break
+            reading = [term for term in reading if len(self.postings[term]) > stop]
+            if reading and len(scores) >= limit:
+                if stop >= MAX_SCAN_DEPTH:
+                    break
+                # Keep reading only terms whose next posting could outrank the last result
+                last = rank_key(heapq.nlargest(limit, scores, key=rank_key)[-1])
+                reading = [
+                    term for term in reading
+                    if self._frontier(first, [term], stop, rest_best) > last
+                ]
+            if not reading:
+                break
+            start, stop = stop, stop * 2
+
+        if limit is None:
+            ranked = sorted(scores, key=rank_key, reverse=True)
+        else:
+            ranked = heapq.nlargest(limit, scores, key=rank_key)
+        return [self.docs[doc] for doc in ranked]
+
+
+PAGE_SIZE = 24
+MAX_RECOMMENDATIONS = 12
+
+# Set VIBETUBE_CATALOG to a .json/.jsonl/.sqlite file to serve a larger catalog
+CATALOG: Catalog = load_catalog(os.environ.get("VIBETUBE_CATALOG"))
+VIDEO_INDEX: Dict[str, int] = CATALOG.index
+
+_search_index: Optional[SearchIndex] = None
+
+
+def build_search_index() -> None:
+    global _search_index
+    _search_index = SearchIndex(CATALOG)
+
+
+def get_search_index() -> Optional[SearchIndex]:
+    # None until the startup build has finished; requests never build it themselves
+    return _search_index
+
+
+# Build the index once at startup in the background so the server is up right away.
+# The debug reloader's watcher process never serves requests, so it skips the build.
+if __name__ != "__main__" or os.environ.get("WERKZEUG_RUN_MAIN"):
+    threading.Thread(target=build_search_index, name="search-index", daemon=True).start()
+
+
+def catalog_templates(positions) -> List[dict]:
+    return [CATALOG.template(CATALOG.offsets[position]) for position in positions]
+
+
+def parse_cursor(value: str) -> int:
+    return int(value) if value.isdigit() else 0
 
 
 @app.route("/")
 def home():
     query: str = request.args.get("q", "").strip()
-    if query:
-        lowered = query.lower()
-        filtered = [
-            v.to_template()
-            for v in VIDEOS
-            if lowered in v.title.lower() or lowered in v.channel.lower()
-        ]
+    # The cursor is the position of the first item on the page; one extra item is
+    # fetched to know whether a next page exists
+    cursor = parse_cursor(request.args.get("cursor", ""))
+    end = cursor + PAGE_SIZE
+    search_index = get_search_index()
+    if query and search_index is None:
+        page = []
+    elif query:
+        page = catalog_templates(search_index.search_docs(query, limit=end + 1)[cursor:])
     else:
-        filtered = [v.to_template() for v in VIDEOS]
+        page = catalog_templates(range(cursor, min(end + 1, len(CATALOG))))
 
+    next_cursor = end if len(page) > PAGE_SIZE else None
     return render_template(
         "index.html",
-        videos=filtered,
+        videos=page[:PAGE_SIZE],
         query=query,
+        next_cursor=next_cursor,
+        indexing=bool(query) and search_index is None,
     )
 
 
 @app.route("/watch/<video_id>")
 def watch(video_id: str):
-    video: Optional[Video] = VIDEO_INDEX.get(video_id)
-    if not video:
+    offset: Optional[int] = VIDEO_INDEX.get(video_id)
+    if offset is None:
         abort(404)
 
-    # Simple recommendation list: others except current
-    recommendations = [v.to_template() for v in VIDEOS if v.id != video_id]
+    # Simple recommendation list: others except current, capped
+    candidates = catalog_templates(range(min(MAX_RECOMMENDATIONS + 1, len(CATALOG))))
+    recommendations = [v for v in candidates if v["id"] != video_id][:MAX_RECOMMENDATIONS]
     return render_template(
         "watch.html",
-        video=video.to_template(),
+        video=CATALOG.template(offset),
         recommendations=recommendations,
     )
 
@@ -1,71 +1,61 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import re
 from datetime import datetime
 
-def get_kospi_index():
+# aiohttp는 선택적으로 import (없으면 스레드에서 requests 세션으로 동시 요청)
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# 네이버 금융 주소 (로컬 테스트 서버를 쓰려면 --base-url로 변경)
+NAVER_FINANCE_URL = "https://finance.naver.com"
+
+# User-Agent 헤더 설정 (봇 차단 방지)
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# 요청당 제한 시간(초)과 실패 시 재시도 횟수
+REQUEST_TIMEOUT = 5
+MAX_RETRIES = 2
+
+# 지수 코드별 시세 페이지에서 찾을 이름
+MARKET_INDICES = {
+    'KOSPI': '코스피',
+    'KOSDAQ': '코스닥',
+    'KPI200': '코스피200',
+}
+
+def index_page_url(code, base_url=NAVER_FINANCE_URL):
+    """지수 코드의 네이버 금융 시세 페이지 주소"""
+    return f"{base_url.rstrip('/')}/sise/sise_index.naver?code={code}"
+
+def get_kospi_index(session=None, base_url=NAVER_FINANCE_URL, timeout=REQUEST_TIMEOUT):
     """
     네이버 금융에서 코스피 지수를 가져오는 함수
     """
     try:
         # 네이버 금융 메인 페이지 URL
-        url = "https://finance.naver.com/"
-        
-        # User-Agent 헤더 설정 (봇 차단 방지)
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
+        url = base_url.rstrip('/') + "/"
         
-        # 웹페이지 요청
-        response = requests.get(url, headers=headers)
+        # 웹페이지 요청 (세션이 주어지면 연결을 재사용)
+        response = (session or requests).get(url, headers=HEADERS, timeout=timeout)
         response.raise_for_status()  # HTTP 에러 체크
         
-        # HTML 파싱
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # 코스피 지수 정보 찾기
-        kospi_info = {}
-        
-        # 방법 1: 특정 클래스나 ID로 찾기
-        kospi_elements = soup.find_all(['span', 'div', 'td'], string=re.compile(r'코스피'))
-        
-        # 방법 2: 지수 관련 텍스트가 포함된 요소 찾기
-        index_elements = soup.find_all(string=re.compile(r'3,?\d{3}\.\d{2}'))
-        
-        # 방법 3: 더 구체적인 패턴으로 코스피 데이터 찾기
-        kospi_pattern = re.compile(r'코스피.*?(\d{1,3}(?:,\d{3})*\.\d{2}).*?([+-]?\d+\.\d{2})')
-        
-        # 페이지 전체 텍스트에서 코스피 정보 검색
-        page_text = soup.get_text()
-        kospi_matches = kospi_pattern.findall(page_text)
-        
-        if kospi_matches:
-            for match in kospi_matches:
-                index_value = match[0].replace(',', '')
-                change_value = match[1]
-                kospi_info['index'] = float(index_value)
-                kospi_info['change'] = float(change_value)
-                break
-        
-        # 방법 4: 테이블이나 특정 구조에서 찾기
-        if not kospi_info:
-            # 시세 관련 테이블이나 div 찾기
-            market_elements = soup.find_all(['table', 'div'], class_=re.compile(r'(market|index|sise)', re.I))
-            
-            for element in market_elements:
-                text = element.get_text()
-                if '코스피' in text:
-                    # 숫자 패턴 찾기
-                    numbers = re.findall(r'(\d{1,3}(?:,\d{3})*\.\d{2})', text)
-                    if numbers:
-                        kospi_info['index'] = float(numbers[0].replace(',', ''))
-                        # 변화량 찾기
-                        changes = re.findall(r'([+-]?\d+\.\d{2})', text)
-                        if changes:
-                            kospi_info['change'] = float(changes[0])
-                        break
-        
-        return kospi_info
+        return extract_index_info(response.content)
         
     except requests.RequestException as e:
         print(f"웹페이지 요청 중 오류 발생: {e}")
@@ -74,12 +64,425 @@ def get_kospi_index():
         print(f"데이터 파싱 중 오류 발생: {e}")
         return None
 
-def format_kospi_info(kospi_info):
+# 메인 페이지에서 지수별 시세 영역의 클래스 (시세 페이지는 id="quotient" 영역 사용)
+INDEX_AREA_CLASSES = {
+    '코스피': 'kospi_area',
+    '코스닥': 'kosdaq_area',
+    '코스피200': 'kospi200_area',
+}
+
+# 자주 쓰는 정규식은 미리 컴파일
+NUMBER_PATTERN = re.compile(r'(\d{1,3}(?:,\d{3})*\.\d{2})')
+CHANGE_PATTERN = re.compile(r'([+-]?\d+\.\d{2})')
+MARKET_CLASS_PATTERN = re.compile(r'(market|index|sise)', re.I)
+VALUE_SELECTOR = '#now_value, .num'
+CHANGE_SELECTOR = '#change_value_and_rate > span, .num2'
+
+CHARSET_PATTERN = re.compile(rb'charset=["\']?([\w-]+)', re.I)
+# 시세 영역 시작 위치부터 이 길이만큼만 잘라서 파싱
+SECTION_WINDOW = 4000
+
+def _section_class_pattern(label):
+    classes = ['quotient']
+    if label in INDEX_AREA_CLASSES:
+        classes.append(INDEX_AREA_CLASSES[label])
+    return re.compile(r'\b(' + '|'.join(classes) + r')\b')
+
+def _decode_html(html):
+    """바이트로 받은 HTML을 meta charset(네이버는 euc-kr)에 맞게 한 번에 디코딩"""
+    if isinstance(html, str):
+        return html
+    match = CHARSET_PATTERN.search(html, 0, 2048)
+    encoding = match.group(1).decode('ascii') if match else 'utf-8'
+    try:
+        return html.decode(encoding, errors='replace')
+    except LookupError:
+        return html.decode('utf-8', errors='replace')
+
+def extract_index_info_fast(html, label='코스피'):
+    """
+    지수 시세 영역만 파싱해서 값을 찾는 빠른 방법
+
+    정규식으로 시세 영역(시세 페이지의 quotient, 메인 페이지의 kospi_area 등)의
+    시작 위치를 찾아 그 부분만 잘라 파싱하고, CSS 선택자로 현재 지수와 변화량을
+    읽음. 못 찾으면 빈 dict 반환.
+    """
+    text = _decode_html(html)
+    section_pattern = _section_class_pattern(label)
+    start_pattern = re.compile(r'class="[^"]*' + section_pattern.pattern)
+    
+    match = start_pattern.search(text)
+    if not match:
+        return {}
+    start = text.rfind('<', 0, match.start())
+    snippet = text[start:start + SECTION_WINDOW]
+    soup = BeautifulSoup(snippet, 'html.parser', parse_only=SoupStrainer(class_=section_pattern))
+    
+    for section in soup.find_all(class_=section_pattern):
+        value_element = section.select_one(VALUE_SELECTOR)
+        if value_element is None:
+            continue
+        numbers = NUMBER_PATTERN.findall(value_element.get_text())
+        if not numbers:
+            continue
+        kospi_info = {'index': float(numbers[0].replace(',', ''))}
+        
+        change_element = section.select_one(CHANGE_SELECTOR)
+        changes = CHANGE_PATTERN.findall(change_element.get_text()) if change_element else []
+        if changes:
+            change = float(changes[0].replace(',', ''))
+            # 네이버는 변화량을 부호 없이 보여주고 '하락' 표시로 방향을 구분함
+            if change > 0 and '하락' in section.get_text():
+                change = -change
+            kospi_info['change'] = change
+        return kospi_info
+    
+    return {}
+
+def extract_index_info_heuristic(html, label='코스피'):
+    """
+    페이지 전체를 파싱해서 정규식으로 지수를 찾는 방법 (구조가 바뀌었을 때의 대비책)
+    """
+    # HTML 파싱
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # 지수 정보 찾기
+    kospi_info = {}
+    
+    # 방법 1: 더 구체적인 패턴으로 지수 데이터 찾기
+    kospi_pattern = re.compile(re.escape(label) + r'.*?(\d{1,3}(?:,\d{3})*\.\d{2}).*?([+-]?\d+\.\d{2})')
+    
+    # 페이지 전체 텍스트에서 지수 정보 검색
+    page_text = soup.get_text()
+    match = kospi_pattern.search(page_text)
+    
+    if match:
+        kospi_info['index'] = float(match.group(1).replace(',', ''))
+        kospi_info['change'] = float(match.group(2))
+    
+    # 방법 2: 테이블이나 특정 구조에서 찾기
+    if not kospi_info:
+        # 시세 관련 테이블이나 div 찾기
+        market_elements = soup.find_all(['table', 'div'], class_=MARKET_CLASS_PATTERN)
+        
+        for element in market_elements:
+            text = element.get_text()
+            if label in text:
+                # 숫자 패턴 찾기
+                numbers = NUMBER_PATTERN.findall(text)
+                if numbers:
+                    kospi_info['index'] = float(numbers[0].replace(',', ''))
+                    # 변화량 찾기
+                    changes = CHANGE_PATTERN.findall(text)
+                    if changes:
+                        kospi_info['change'] = float(changes[0])
+                    break
+    
+    return kospi_info
+
+def extract_index_info(html, label='코스피'):
+    """
+    HTML에서 label(예: 코스피, 코스닥) 지수와 전일 대비 변화량을 찾는 함수
+
+    시세 영역만 파싱하는 빠른 방법을 먼저 쓰고, 실패하면 전체 페이지 검색으로 대체.
+    """
+    return extract_index_info_fast(html, label) or extract_index_info_heuristic(html, label)
+
+def benchmark_parsers(paths, label='코스피', repeat=20):
+    """저장된 HTML 파일로 빠른 파싱과 전체 페이지 파싱의 1회당 소요 시간을 비교"""
+    print(f"=== 파서 벤치마크 ({label}, {repeat}회 평균) ===")
+    for path in paths:
+        with open(path, 'rb') as f:
+            html = f.read()
+        timings = {}
+        results = {}
+        for name, func in (("전체 파싱", extract_index_info_heuristic), ("영역 파싱", extract_index_info_fast)):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                results[name] = func(html, label)
+            timings[name] = (time.perf_counter() - start) / repeat
+        fast = timings["영역 파싱"]
+        speedup = timings["전체 파싱"] / fast if fast else float('inf')
+        print(f"  - {os.path.basename(path)}: 전체 {timings['전체 파싱'] * 1000:.2f}ms, "
+              f"영역 {fast * 1000:.2f}ms → {speedup:.1f}배 "
+              f"(결과: {results['영역 파싱'] or '없음'} / {results['전체 파싱'] or '없음'})")
+
+async def _fetch_html_aiohttp(session, url, timeout, retries):
+    """aiohttp 세션으로 페이지를 가져옴 (시간 초과·연결 오류·5xx 서버 오류만 재시도)"""
+    for attempt in range(retries + 1):
+        try:
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                response.raise_for_status()
+                return await response.read()
+        except aiohttp.ClientResponseError as e:
+            # 404·403 같은 4xx 응답은 다시 요청해도 같으므로 바로 실패
+            if e.status < 500 or attempt == retries:
+                raise
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if attempt == retries:
+                raise
+        await asyncio.sleep(0.5 * 2 ** attempt)
+
+async def _fetch_html_threaded(session, url, timeout, retries):
+    """aiohttp가 없을 때: requests 세션 요청을 스레드에서 실행 (재시도 조건은 aiohttp 버전과 같음)"""
+    for attempt in range(retries + 1):
+        try:
+            response = await asyncio.to_thread(session.get, url, headers=HEADERS, timeout=timeout)
+            response.raise_for_status()
+            return response.content
+        except requests.HTTPError as e:
+            if e.response is None or e.response.status_code < 500 or attempt == retries:
+                raise
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == retries:
+                raise
+        await asyncio.sleep(0.5 * 2 ** attempt)
+
+async def fetch_market_indices(codes=tuple(MARKET_INDICES), base_url=NAVER_FINANCE_URL,
+                               timeout=REQUEST_TIMEOUT, retries=MAX_RETRIES):
+    """
+    여러 지수(KOSPI, KOSDAQ 등)의 시세 페이지를 하나의 연결 풀로 동시에 가져오는 함수
+
+    반환값: {지수 코드: {'index': ..., 'change': ...} 또는 실패 시 None}
+    """
+    async def fetch_one(fetch, session, code):
+        url = index_page_url(code, base_url)
+        try:
+            html = await fetch(session, url, timeout, retries)
+            return extract_index_info(html, MARKET_INDICES.get(code, code))
+        except Exception as e:
+            print(f"{code} 지수를 가져오는 중 오류 발생: {e}")
+            return None
+
+    if AIOHTTP_AVAILABLE:
+        connector = aiohttp.TCPConnector(limit=len(codes) or 1)
+        async with aiohttp.ClientSession(headers=HEADERS, connector=connector) as session:
+            results = await asyncio.gather(*(fetch_one(_fetch_html_aiohttp, session, code) for code in codes))
+    else:
+        with requests.Session() as session:
+            results = await asyncio.gather(*(fetch_one(_fetch_html_threaded, session, code) for code in codes))
+
+    return dict(zip(codes, results))
+
+def get_market_indices(codes=tuple(MARKET_INDICES), base_url=NAVER_FINANCE_URL,
+                       timeout=REQUEST_TIMEOUT, retries=MAX_RETRIES):
+    """fetch_market_indices의 동기 버전 (스크립트에서 바로 호출할 때 사용)"""
+    return asyncio.run(fetch_market_indices(codes, base_url, timeout, retries))
+
+def fetch_if_changed(session, url, state, timeout=REQUEST_TIMEOUT):
+    """
+    조건부 요청으로 페이지를 가져오는 함수
+
+    state에 저장한 ETag/Last-Modified를 If-None-Match/If-Modified-Since로 보내고,
+    304 응답이거나 본문 해시가 이전과 같으면 None, 바뀌었으면 본문을 반환.
+    """
+    headers = {}
+    if state.get('etag'):
+        headers['If-None-Match'] = state['etag']
+    if state.get('last_modified'):
+        headers['If-Modified-Since'] = state['last_modified']
+    
+    response = session.get(url, headers=headers, timeout=timeout)
+    if response.status_code == 304:
+        return None
+    response.raise_for_status()
+    
+    state['etag'] = response.headers.get('ETag')
+    state['last_modified'] = response.headers.get('Last-Modified')
+    body_hash = hashlib.sha256(response.content).hexdigest()
+    if body_hash == state.get('body_hash'):
+        return None
+    state['body_hash'] = body_hash
+    return response.content
+
+def make_snapshot(kospi_info, ttl):
+    """최신 지수와 유효 기간을 담은 게시용 데이터"""
+    now = time.time()
+    return {
+        'kospi_info': kospi_info,
+        'updated_at': datetime.fromtimestamp(now).isoformat(timespec='seconds'),
+        'expires_at': now + ttl,
+    }
+
+def write_snapshot(path, snapshot):
+    """임시 파일에 쓴 뒤 교체해서 읽는 쪽이 항상 완성된 JSON을 보도록 함"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def serve_snapshot(latest, port):
+    """latest['snapshot']을 JSON으로 돌려주는 로컬 HTTP 서버를 백그라운드로 시작"""
+    class SnapshotHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            snapshot = latest.get('snapshot')
+            if snapshot is None:
+                self._send_json(503, {'error': '아직 조회된 데이터가 없습니다.'})
+                return
+            remaining = int(snapshot['expires_at'] - time.time())
+            body = dict(snapshot, stale=remaining <= 0)
+            self._send_json(200, body, max_age=max(remaining, 0))
+        
+        def _send_json(self, status, data, max_age=0):
+            payload = json.dumps(data, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(payload)))
+            self.send_header('Cache-Control', f'max-age={max_age}')
+            self.end_headers()
+            self.wfile.write(payload)
+        
+        def log_message(self, format, *args):
+            pass
+    
+    server = ThreadingHTTPServer(('127.0.0.1', port), SnapshotHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def poll_kospi_index(interval, base_url=NAVER_FINANCE_URL, timeout=REQUEST_TIMEOUT,
+                     output=None, port=None, ttl=None, history=None):
+    """
+    하나의 세션을 유지하면서 interval초마다 코스피 지수를 확인하는 함수
+
+    페이지가 바뀌었을 때만 파싱하고, 최신 값을 output 파일과 로컬 HTTP 엔드포인트로
+    게시함. ttl(기본값 interval의 3배)이 지나도록 갱신되지 않으면 stale로 표시됨.
+    history가 주어지면 확인할 때마다 최신 값을 기록 파일에 덧붙임.
+    """
+    ttl = ttl or interval * 3
+    url = base_url.rstrip('/') + "/"
+    state = {}
+    latest = {}
+    server = serve_snapshot(latest, port) if port else None
+    if server:
+        print(f"최신 지수 제공: http://127.0.0.1:{port}/")
+    
+    with requests.Session() as session:
+        session.headers.update(HEADERS)
+        next_run = time.monotonic()
+        try:
+            while True:
+                try:
+                    html = fetch_if_changed(session, url, state, timeout)
+                    if html is not None:
+                        kospi_info = extract_index_info(html)
+                        if kospi_info:
+                            latest['kospi_info'] = kospi_info
+                            print(format_kospi_info(kospi_info))
+                    # 값이 그대로여도 유효 기간은 갱신
+                    if latest.get('kospi_info'):
+                        latest['snapshot'] = make_snapshot(latest['kospi_info'], ttl)
+                        if output:
+                            write_snapshot(output, latest['snapshot'])
+                        if history:
+                            append_history(history, latest['kospi_info'])
+                except requests.RequestException as e:
+                    print(f"웹페이지 요청 중 오류 발생: {e}")
+                
+                next_run += interval
+                time.sleep(max(0, next_run - time.monotonic()))
+        except KeyboardInterrupt:
+            print("\n조회를 종료합니다.")
+        finally:
+            if server:
+                server.shutdown()
+
+# 지수 기록 파일의 레코드 형식: (유닉스 시각, 지수, 변화량) float64 3개 = 24바이트
+# 시간순으로만 덧붙이므로 파일 자체가 시각 기준으로 정렬된 인덱스 역할을 함
+HISTORY_RECORD = struct.Struct('<ddd')
+
+def append_history(path, kospi_info, timestamp=None):
     """
-    코스피 정보를 보기 좋게 포맷팅하는 함수
+    지수 샘플 하나를 기록 파일 끝에 덧붙임 (이전 기록보다 이른 시각은 마지막 시각으로 맞춤)
+
+    쓰다가 중단되어 끝에 잘린 레코드가 남아 있으면 잘라낸 뒤 씀 ('ab'는 seek를 무시하고
+    항상 파일 끝에 쓰므로 'r+b'로 열어서 레코드 경계를 맞춤).
+    """
+    timestamp = time.time() if timestamp is None else timestamp
+    change = kospi_info.get('change')
+    try:
+        open(path, 'xb').close()
+    except FileExistsError:
+        pass
+    with open(path, 'r+b') as f:
+        count = f.seek(0, os.SEEK_END) // HISTORY_RECORD.size
+        if count:
+            timestamp = max(timestamp, _read_record(f, count - 1)[0])
+        f.truncate(count * HISTORY_RECORD.size)
+        f.seek(count * HISTORY_RECORD.size)
+        f.write(HISTORY_RECORD.pack(timestamp, kospi_info['index'],
+                                    math.nan if change is None else change))
+
+def _read_record(f, position):
+    f.seek(position * HISTORY_RECORD.size)
+    return HISTORY_RECORD.unpack(f.read(HISTORY_RECORD.size))
+
+def _bisect_history(f, count, timestamp):
+    """timestamp 이상인 첫 레코드 위치를 이진 탐색 (레코드를 log2(n)개만 읽음)"""
+    low, high = 0, count
+    while low < high:
+        middle = (low + high) // 2
+        if _read_record(f, middle)[0] < timestamp:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+def iter_history(path, start=None, end=None, chunk_records=4096):
+    """
+    [start, end) 구간의 (시각, 지수, 변화량)을 순서대로 반환하는 함수
+
+    시작 위치는 이진 탐색으로 찾고 이후 chunk_records개씩 읽으므로 전체 기록을
+    메모리에 올리지 않음.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb') as f:
+        count = f.seek(0, os.SEEK_END) // HISTORY_RECORD.size
+        position = _bisect_history(f, count, start) if start is not None else 0
+        f.seek(position * HISTORY_RECORD.size)
+        while position < count:
+            records = min(chunk_records, count - position)
+            chunk = f.read(records * HISTORY_RECORD.size)
+            for timestamp, index, change in HISTORY_RECORD.iter_unpack(chunk):
+                if end is not None and timestamp >= end:
+                    return
+                yield timestamp, index, change
+            position += records
+
+def downsample_history(path, start=None, end=None, bucket=60):
+    """구간을 bucket초 단위로 묶어 지수의 최소/최대/마지막 값을 반환 (한 구간씩 계산)"""
+    current = None
+    for timestamp, index, change in iter_history(path, start, end):
+        bucket_start = timestamp - timestamp % bucket
+        if current is None or current['time'] != bucket_start:
+            if current is not None:
+                yield current
+            current = {'time': bucket_start, 'min': index, 'max': index, 'last': index, 'change': change}
+        else:
+            current['min'] = min(current['min'], index)
+            current['max'] = max(current['max'], index)
+            current['last'] = index
+            current['change'] = change
+    if current is not None:
+        yield current
+
+def print_history(path, start=None, end=None, bucket=60):
+    """기록 파일의 구간 요약을 표 형태로 출력"""
+    print(f"=== 코스피 지수 기록 ({bucket:g}초 단위) ===")
+    rows = 0
+    for row in downsample_history(path, start, end, bucket):
+        rows += 1
+        label = datetime.fromtimestamp(row['time']).strftime("%Y-%m-%d %H:%M:%S")
+        print(f"{label}  최저 {row['min']:,.2f}  최고 {row['max']:,.2f}  마지막 {row['last']:,.2f}")
+    if not rows:
+        print("해당 구간의 기록이 없습니다.")
+
+def format_kospi_info(kospi_info, name='코스피'):
+    """
+    코스피(또는 name으로 지정한 지수) 정보를 보기 좋게 포맷팅하는 함수
     """
     if not kospi_info:
-        return "코스피 지수 정보를 가져올 수 없습니다."
+        return f"{name} 지수 정보를 가져올 수 없습니다."
     
     current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
@@ -98,7 +501,7 @@ def format_kospi_info(kospi_info):
         change_str = str(change)
     
     result = f"""
-=== 코스피 지수 정보 ===
+=== {name} 지수 정보 ===
 조회 시간: {current_time}
 현재 지수: {index:,.2f}
 전일 대비: {change_str}
@@ -107,16 +510,71 @@ def format_kospi_info(kospi_info):
     
     return result.strip()
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="네이버 금융 지수 조회 프로그램")
+    parser.add_argument("--all", action="store_true",
+                        help=f"{', '.join(MARKET_INDICES)} 지수를 동시에 조회")
+    parser.add_argument("--base-url", default=NAVER_FINANCE_URL,
+                        help="조회할 서버 주소 (저장된 HTML을 제공하는 로컬 테스트 서버 등)")
+    parser.add_argument("--timeout", type=float, default=REQUEST_TIMEOUT,
+                        help=f"요청당 제한 시간(초, 기본값 {REQUEST_TIMEOUT})")
+    parser.add_argument("--watch", type=float, metavar="SECONDS",
+                        help="종료할 때까지 SECONDS초마다 코스피 지수를 확인")
+    parser.add_argument("--output", help="--watch 모드에서 최신 지수를 기록할 JSON 파일")
+    parser.add_argument("--port", type=int, help="--watch 모드에서 최신 지수를 제공할 로컬 포트")
+    parser.add_argument("--ttl", type=float,
+                        help="--watch 모드에서 게시한 값의 유효 시간(초, 기본값: 확인 주기의 3배)")
+    parser.add_argument("--history", metavar="FILE",
+                        help="조회한 코스피 지수를 덧붙일 기록 파일 (--since/--until과 함께 쓰면 조회)")
+    parser.add_argument("--since", help="기록 조회 시작 시각 (예: 2024-01-02T09:00)")
+    parser.add_argument("--until", help="기록 조회 종료 시각 (예: 2024-01-02T15:30)")
+    parser.add_argument("--bucket", type=float, default=60,
+                        help="기록 조회 시 묶을 단위(초, 기본값 60)")
+    parser.add_argument("--benchmark", nargs='+', metavar="HTML",
+                        help="저장된 HTML 파일로 파서 속도만 비교하고 종료")
+    return parser.parse_args()
+
 def main():
     """
     메인 실행 함수
     """
-    print("네이버 금융에서 코스피 지수를 가져오는 중...")
+    args = parse_args()
+    
+    if args.benchmark:
+        benchmark_parsers(args.benchmark)
+        return
     
-    kospi_info = get_kospi_index() 
-    result = format_kospi_info(kospi_info)
+    if args.history and (args.since or args.until):
+        start = datetime.fromisoformat(args.since).timestamp() if args.since else None
+        end = datetime.fromisoformat(args.until).timestamp() if args.until else None
+        print_history(args.history, start, end, args.bucket)
+        return
     
-    print(result)
+    if args.watch:
+        print(f"네이버 금융에서 {args.watch:g}초마다 코스피 지수를 확인합니다. (Ctrl+C로 종료)")
+        poll_kospi_index(args.watch, args.base_url, args.timeout, args.output, args.port, args.ttl,
+                         args.history)
+        return
+    
+    if args.all:
+        print("네이버 금융에서 주요 지수를 동시에 가져오는 중...")
+        indices = get_market_indices(base_url=args.base_url, timeout=args.timeout)
+        for code, info in indices.items():
+            print(format_kospi_info(info, MARKET_INDICES[code]))
+        kospi_info = indices.get('KOSPI')
+        
+        if kospi_info and args.history:
+            append_history(args.history, kospi_info)
+    else:
+        print("네이버 금융에서 코스피 지수를 가져오는 중...")
+        
+        kospi_info = get_kospi_index(base_url=args.base_url, timeout=args.timeout)
+        result = format_kospi_info(kospi_info)
+        
+        print(result)
+        
+        if kospi_info and args.history:
+            append_history(args.history, kospi_info)
     
     # 추가 정보 출력
     if kospi_info:
@@ -1,5 +1,271 @@
 import pyttsx3
 import os
+import re
+import wave
+import argparse
+import shutil
+import tempfile
+import itertools
+import hashlib
+import unicodedata
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# 문장 끝(영어/한국어/중국어 구두점) 뒤의 공백에서 나눔
+SENTENCE_END = re.compile(r'(?<=[.!?。！？])\s+')
+# 한 번에 합성할 최대 글자 수 (문장 여러 개를 이 길이까지 묶음)
+DEFAULT_CHUNK_CHARS = 1000
+# WAV 파일을 이어 붙일 때 한 번에 복사할 프레임 수
+COPY_FRAMES = 65536
+# 음성 캐시 기본 위치와 최대 크기
+DEFAULT_CACHE_DIR = ".tts_cache"
+DEFAULT_CACHE_BYTES = 200 * 1024 * 1024
+# 캐시 모드에서 한 번의 runAndWait로 합성할 최대 문장 수
+CACHE_BATCH = 32
+
+def create_engine(rate=180, volume=0.8):
+    """TTS 엔진을 초기화하고 한국어 음성, 속도, 음량을 설정"""
+    engine = pyttsx3.init()
+    
+    # 음성 설정 (한국어 지원)
+    voices = engine.getProperty('voices')
+    
+    # 한국어 음성을 찾아서 설정 (가능한 경우)
+    for voice in voices:
+        if 'korean' in voice.name.lower() or 'korea' in voice.name.lower():
+            engine.setProperty('voice', voice.id)
+            break
+    
+    # 음성 속도 설정 (기본값은 200)
+    engine.setProperty('rate', rate)
+    
+    # 음량 설정 (0.0 ~ 1.0)
+    engine.setProperty('volume', volume)
+    return engine
+
+def iter_sentences(input_file, max_chars=DEFAULT_CHUNK_CHARS):
+    """
+    파일을 한 줄씩 읽으면서 문장 단위로 나눠 (문장, 지금까지 읽은 바이트 수)를 반환
+
+    파일 전체를 한 번에 읽지 않으므로 큰 문서도 메모리를 적게 쓰고, 읽은 바이트 수로
+    진행률을 계산할 수 있음. 문장 끝이 없는 아주 긴 줄은 max_chars에서 강제로 나눔.
+    """
+    pending = ''
+    bytes_read = 0
+    with open(input_file, 'r', encoding='utf-8') as file:
+        for line in file:
+            bytes_read += len(line.encode('utf-8'))
+            pending += line
+            sentences = SENTENCE_END.split(pending)
+            # 마지막 조각은 문장이 아직 끝나지 않았을 수 있으므로 남겨둠
+            pending = sentences.pop()
+            for sentence in sentences:
+                sentence = sentence.strip()
+                if sentence:
+                    yield sentence, bytes_read
+            while len(pending) > max_chars:
+                yield pending[:max_chars], bytes_read
+                pending = pending[max_chars:]
+    
+    tail = pending.strip()
+    if tail:
+        yield tail, bytes_read
+
+def iter_text_chunks(input_file, max_chars=DEFAULT_CHUNK_CHARS):
+    """문장들을 max_chars 이하의 조각으로 묶어 (조각, 지금까지 읽은 바이트 수)를 반환"""
+    chunk = ''
+    chunk_bytes = 0
+    for sentence, bytes_read in iter_sentences(input_file, max_chars):
+        if chunk and len(chunk) + len(sentence) + 1 > max_chars:
+            yield chunk, chunk_bytes
+            chunk = ''
+        chunk = f"{chunk} {sentence}" if chunk else sentence
+        chunk_bytes = bytes_read
+    if chunk:
+        yield chunk, chunk_bytes
+
+def normalize_sentence(sentence):
+    """캐시 키용 문장 정규화 (유니코드 NFC, 연속 공백을 하나로)"""
+    return ' '.join(unicodedata.normalize('NFC', sentence).split())
+
+class AudioCache:
+    """
+    (정규화된 문장, 음성 id, 속도, 음량)을 키로 합성 결과 WAV를 보관하는 디스크 캐시
+
+    파일 수정 시각을 마지막 사용 시각으로 쓰고, 전체 크기가 max_bytes를 넘으면
+    가장 오래 쓰지 않은 파일부터 지움 (LRU).
+    """
+    
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        self.total_bytes = sum(entry.stat().st_size for entry in os.scandir(directory)
+                               if entry.name.endswith('.wav'))
+    
+    def key(self, sentence, voice_id, rate, volume):
+        raw = '\x1f'.join([normalize_sentence(sentence), str(voice_id), str(rate), str(volume)])
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+    
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.wav")
+    
+    def get(self, key):
+        """캐시에 있으면 경로를 반환하고 사용 시각을 갱신, 없으면 None"""
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+    
+    def put(self, key, wav_path):
+        """합성된 WAV 파일을 캐시로 옮기고 캐시 경로를 반환"""
+        path = self.path(key)
+        os.replace(wav_path, path)
+        self.total_bytes += os.path.getsize(path)
+        return path
+    
+    def evict(self):
+        """전체 크기가 max_bytes 이하가 될 때까지 오래 쓰지 않은 파일부터 삭제"""
+        if self.total_bytes <= self.max_bytes:
+            return
+        entries = sorted((entry.stat().st_mtime_ns, entry.stat().st_size, entry.path)
+                         for entry in os.scandir(self.directory) if entry.name.endswith('.wav'))
+        self.total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self.total_bytes <= self.max_bytes:
+                break
+            os.remove(path)
+            self.total_bytes -= size
+    
+    @property
+    def hit_ratio(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+def render_with_cache(engine, cache, sentences):
+    """
+    문장 목록의 WAV 경로를 순서대로 반환 (캐시에 없는 문장만 한 번에 합성해서 캐시에 저장)
+
+    합성 결과는 캐시 폴더 안의 임시 폴더에 만들어서, 캐시로 옮길 때 다른 파일 시스템
+    사이의 이동(os.replace 실패)이 생기지 않게 함.
+    """
+    settings = (engine.getProperty('voice'), engine.getProperty('rate'), engine.getProperty('volume'))
+    paths = []
+    queued = {}
+    staging_dir = None
+    try:
+        for i, sentence in enumerate(sentences):
+            key = cache.key(sentence, *settings)
+            if key in queued:
+                # 같은 묶음 안에서 반복된 문장은 한 번만 합성하고 적중으로 셈
+                cache.hits += 1
+                paths.append(key)
+                continue
+            path = cache.get(key)
+            if path is None:
+                if staging_dir is None:
+                    staging_dir = tempfile.mkdtemp(dir=cache.directory)
+                queued[key] = os.path.join(staging_dir, f"{i}.wav")
+                engine.save_to_file(sentence, queued[key])
+                path = key
+            paths.append(path)
+        
+        if queued:
+            engine.runAndWait()
+            rendered = {key: cache.put(key, tmp_path) for key, tmp_path in queued.items()}
+            paths = [rendered.get(path, path) for path in paths]
+    finally:
+        if staging_dir is not None:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+    return paths
+
+def append_wav(writer, wav_path, audio_format=None):
+    """
+    wav_path의 오디오 프레임을 열린 WAV writer 뒤에 조금씩 복사
+
+    audio_format은 지금까지 쓴 (채널 수, 샘플 폭, 샘플레이트)이며, None이면 이 파일의
+    형식으로 writer를 설정함. 이 파일의 형식을 반환.
+    """
+    with wave.open(wav_path, 'rb') as reader:
+        chunk_format = (reader.getnchannels(), reader.getsampwidth(), reader.getframerate())
+        if audio_format is None:
+            writer.setnchannels(chunk_format[0])
+            writer.setsampwidth(chunk_format[1])
+            writer.setframerate(chunk_format[2])
+        elif chunk_format != audio_format:
+            raise ValueError(f"{wav_path}의 오디오 형식이 다른 조각과 다릅니다.")
+        while True:
+            frames = reader.readframes(COPY_FRAMES)
+            if not frames:
+                break
+            writer.writeframes(frames)
+    return chunk_format
+
+def text_to_speech_chunked(input_file, output_file, max_chars=DEFAULT_CHUNK_CHARS,
+                           engine=None, progress=True, cache=None):
+    """
+    큰 텍스트 파일을 문장 단위 조각으로 나눠 하나의 엔진으로 차례로 합성하고,
+    조각별 WAV를 바로 output_file 뒤에 이어 붙이는 함수
+
+    조각 하나씩만 메모리와 임시 파일에 두므로 문서 크기와 관계없이 메모리 사용량이
+    일정하고, progress=True이면 조각마다 진행률을 출력함. cache(AudioCache)가 주어지면
+    문장마다 캐시된 WAV를 재사용하고 새로 합성한 문장만 캐시에 추가함.
+    """
+    try:
+        if not os.path.exists(input_file):
+            print(f"오류: {input_file} 파일을 찾을 수 없습니다.")
+            return False
+        
+        total_bytes = os.path.getsize(input_file) or 1
+        if cache is None:
+            pieces = ([chunk] for chunk in iter_text_chunks(input_file, max_chars))
+        else:
+            sentences = iter_sentences(input_file, max_chars)
+            pieces = iter(lambda: list(itertools.islice(sentences, CACHE_BATCH)), [])
+        first = next(pieces, None)
+        if first is None:
+            print(f"오류: {input_file} 파일이 비어있습니다.")
+            return False
+        
+        engine = engine or create_engine()
+        audio_format = None
+        chunk_count = 0
+        
+        with tempfile.TemporaryDirectory() as temp_dir, wave.open(output_file, 'wb') as writer:
+            chunk_path = os.path.join(temp_dir, 'chunk.wav')
+            for piece in itertools.chain([first], pieces):
+                texts = [text for text, _ in piece]
+                bytes_read = piece[-1][1]
+                if cache is None:
+                    engine.save_to_file(texts[0], chunk_path)
+                    engine.runAndWait()
+                    audio_format = append_wav(writer, chunk_path, audio_format)
+                    os.remove(chunk_path)
+                else:
+                    for path in render_with_cache(engine, cache, texts):
+                        audio_format = append_wav(writer, path, audio_format)
+                    cache.evict()
+                chunk_count += len(texts)
+                if progress:
+                    percent = min(100.0, bytes_read / total_bytes * 100)
+                    print(f"[{chunk_count}] {percent:5.1f}% 변환 완료 ({sum(map(len, texts))}자)")
+        
+        print(f"음성 변환이 완료되었습니다. {chunk_count}개 조각을 합쳐 저장했습니다: {output_file}")
+        if cache is not None:
+            print(f"캐시 적중률: {cache.hit_ratio:.1%} (적중 {cache.hits}, 새로 합성 {cache.misses}, "
+                  f"캐시 크기 {cache.total_bytes / 1024:.1f} KB)")
+        return True
+        
+    except Exception as e:
+        print(f"오류가 발생했습니다: {str(e)}")
+        return False
 
 def text_to_speech(input_file, output_file):
     """
@@ -21,23 +287,8 @@ def text_to_speech(input_file, output_file):
         print(f"읽은 텍스트 내용:\n{text}")
         print("\n음성 변환을 시작합니다...")
         
-        # TTS 엔진 초기화
-        engine = pyttsx3.init()
-        
-        # 음성 설정 (한국어 지원)
-        voices = engine.getProperty('voices')
-        
-        # 한국어 음성을 찾아서 설정 (가능한 경우)
-        for voice in voices:
-            if 'korean' in voice.name.lower() or 'korea' in voice.name.lower():
-                engine.setProperty('voice', voice.id)
-                break
-        
-        # 음성 속도 설정 (기본값은 200)
-        engine.setProperty('rate', 180)
-        
-        # 음량 설정 (0.0 ~ 1.0)
-        engine.setProperty('volume', 0.8)
+        # TTS 엔진 초기화 (한국어 음성, 속도, 음량 설정 포함)
+        engine = create_engine()
         
         # 음성을 파일로 저장
         engine.save_to_file(text, output_file)
@@ -50,12 +301,143 @@ def text_to_speech(input_file, output_file):
         print(f"오류가 발생했습니다: {str(e)}")
         return False
 
+# 작업 실행기에서 워커 프로세스마다 한 번만 만드는 TTS 엔진
+_worker_engine = None
+
+def _init_worker():
+    """워커 시작 시 엔진 초기화와 한국어 음성 검색을 한 번만 수행"""
+    global _worker_engine
+    _worker_engine = create_engine()
+
+def _run_job(job):
+    """워커에서 텍스트 파일 하나를 변환하고 소요 시간과 크기를 반환"""
+    input_file, output_file, max_chars = job
+    start = time.perf_counter()
+    ok = text_to_speech_chunked(input_file, output_file, max_chars,
+                                engine=_worker_engine or create_engine(), progress=False)
+    return {
+        'input': input_file,
+        'output': output_file,
+        'ok': ok,
+        'seconds': round(time.perf_counter() - start, 3),
+        'input_bytes': os.path.getsize(input_file) if os.path.exists(input_file) else 0,
+        'output_bytes': os.path.getsize(output_file) if ok and os.path.exists(output_file) else 0,
+    }
+
+def load_jobs(source, output_dir=None):
+    """
+    폴더(안의 .txt 파일들) 또는 JSON 목록 파일에서 (입력, 출력) 경로 목록을 만듦
+
+    JSON 목록은 ["a.txt", ...] 또는 [{"input": "a.txt", "output": "a.wav"}, ...] 형식이며
+    상대 경로는 목록 파일 위치를 기준으로 함. 출력을 지정하지 않으면 output_dir(없으면
+    입력과 같은 폴더)에 같은 이름의 .wav로 저장.
+    """
+    if os.path.isdir(source):
+        entries = sorted(os.path.join(source, name) for name in os.listdir(source)
+                         if name.lower().endswith('.txt'))
+        base_dir = ''
+    else:
+        with open(source, 'r', encoding='utf-8') as file:
+            entries = json.load(file)
+        base_dir = os.path.dirname(os.path.abspath(source))
+    
+    jobs = []
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {'input': entry}
+        input_file = os.path.join(base_dir, entry['input'])
+        output_file = entry.get('output')
+        if output_file:
+            output_file = os.path.join(base_dir, output_file)
+        else:
+            name = os.path.splitext(os.path.basename(input_file))[0] + '.wav'
+            output_file = os.path.join(output_dir or os.path.dirname(input_file), name)
+        jobs.append((input_file, output_file))
+    return jobs
+
+def run_jobs(jobs, workers=1, max_chars=DEFAULT_CHUNK_CHARS, report_file=None):
+    """
+    여러 텍스트 파일을 프로세스 풀에서 변환하고 파일별 결과를 입력 순서대로 반환
+
+    pyttsx3 엔진은 스레드에 안전하지 않으므로 워커 프로세스마다 엔진을 하나씩 둠.
+    report_file이 주어지면 소요 시간과 바이트 크기를 JSON 보고서로 저장.
+    """
+    tasks = [(input_file, output_file, max_chars) for input_file, output_file in jobs]
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        for i, result in enumerate(executor.map(_run_job, tasks), 1):
+            status = '완료' if result['ok'] else '실패'
+            print(f"[{i}/{len(tasks)}] {os.path.basename(result['input'])} {status} "
+                  f"({result['seconds']:.2f}초, {result['output_bytes']:,} bytes)")
+            results.append(result)
+    
+    if report_file:
+        report = {
+            'workers': workers,
+            'total_seconds': round(time.perf_counter() - start, 3),
+            'succeeded': sum(1 for r in results if r['ok']),
+            'failed': sum(1 for r in results if not r['ok']),
+            'output_bytes': sum(r['output_bytes'] for r in results),
+            'files': results,
+        }
+        with open(report_file, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        print(f"보고서를 저장했습니다: {report_file}")
+    return results
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="텍스트를 음성으로 변환하는 프로그램")
+    parser.add_argument("--input", default="input.txt", help="입력 텍스트 파일 (기본값 input.txt)")
+    parser.add_argument("--output", default="output.wav", help="출력 WAV 파일 (기본값 output.wav)")
+    parser.add_argument("--chunked", action="store_true",
+                        help="큰 파일을 문장 단위로 나눠 합성하고 하나의 WAV로 이어 붙임")
+    parser.add_argument("--cache", action="store_true",
+                        help="문장별 합성 결과를 캐시해서 반복되는 문장은 다시 합성하지 않음 (--chunked 포함)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help=f"음성 캐시 폴더 (기본값 {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--cache-mb", type=float, default=DEFAULT_CACHE_BYTES / 1024 / 1024,
+                        help="음성 캐시 최대 크기(MB, 기본값 200)")
+    parser.add_argument("--jobs", metavar="PATH",
+                        help="여러 파일 변환: .txt 파일이 있는 폴더 또는 JSON 목록 파일")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="--jobs 모드에서 사용할 프로세스 수 (기본값: CPU 코어 수)")
+    parser.add_argument("--output-dir", help="--jobs 모드에서 WAV를 저장할 폴더 (기본값: 입력과 같은 폴더)")
+    parser.add_argument("--report", default="tts_report.json",
+                        help="--jobs 모드의 결과 보고서 JSON 파일 (기본값 tts_report.json)")
+    parser.add_argument("--chunk-chars", type=int, default=DEFAULT_CHUNK_CHARS,
+                        help=f"--chunked 모드에서 한 번에 합성할 최대 글자 수 (기본값 {DEFAULT_CHUNK_CHARS})")
+    args = parser.parse_args()
+    if args.chunk_chars <= 0:
+        parser.error("--chunk-chars 값은 1 이상이어야 합니다.")
+    if args.workers <= 0:
+        parser.error("--workers 값은 1 이상이어야 합니다.")
+    return args
+
 def main():
     """
     메인 함수
     """
-    input_file = "input.txt"
-    output_file = "output.wav"
+    args = parse_args()
+    
+    if args.jobs:
+        print("=== 텍스트를 음성으로 변환하는 프로그램 (여러 파일) ===")
+        jobs = load_jobs(args.jobs, args.output_dir)
+        if not jobs:
+            print(f"오류: {args.jobs}에서 변환할 텍스트 파일을 찾을 수 없습니다.")
+            return
+        if args.output_dir:
+            os.makedirs(args.output_dir, exist_ok=True)
+        workers = min(args.workers, len(jobs))
+        print(f"{len(jobs)}개 파일을 {workers}개 프로세스로 변환합니다.")
+        print()
+        results = run_jobs(jobs, workers, args.chunk_chars, args.report)
+        succeeded = sum(1 for r in results if r['ok'])
+        print(f"\n성공: {succeeded}/{len(results)}개 파일")
+        return
+    
+    input_file = args.input
+    output_file = args.output
     
     print("=== 텍스트를 음성으로 변환하는 프로그램 ===")
     print(f"입력 파일: {input_file}")
@@ -63,7 +445,13 @@ def main():
     print()
     
     # TTS 변환 실행
-    success = text_to_speech(input_file, output_file)
+    if args.cache:
+        cache = AudioCache(args.cache_dir, int(args.cache_mb * 1024 * 1024))
+        success = text_to_speech_chunked(input_file, output_file, args.chunk_chars, cache=cache)
+    elif args.chunked:
+        success = text_to_speech_chunked(input_file, output_file, args.chunk_chars)
+    else:
+        success = text_to_speech(input_file, output_file)
     
     if success:
         print("\n프로그램이 성공적으로 완료되었습니다!")
@@ -1,17 +1,42 @@
 import os
-import glob
-from PIL import Image
+import json
+import hashlib
+import struct
+import zlib
+import time
+import argparse
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image, ImageChops
 import sys
 
+# numpy가 있으면 배열 연산으로 마스크를 만들고, 없으면 Pillow 밴드 연산을 사용
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 # rembg는 선택적으로 import (처음 실행 시 모델 다운로드 시간이 오래 걸림)
 try:
-    from rembg import remove
+    from rembg import remove, new_session
     REMBG_AVAILABLE = True
     print("✓ rembg 라이브러리를 사용합니다.")
 except ImportError:
     REMBG_AVAILABLE = False
     print("⚠ rembg 라이브러리를 사용할 수 없습니다. 기본 배경 제거 방법을 사용합니다.")
 
+# rembg 모델 세션 (프로세스마다 한 번만 로드해서 재사용)
+_rembg_session = None
+
+def get_rembg_session():
+    """현재 프로세스의 rembg 세션을 반환 (처음 호출 시에만 모델 로드)"""
+    global _rembg_session
+    if _rembg_session is None:
+        _rembg_session = new_session()
+    return _rembg_session
+
 def create_output_folder():
     """output 폴더가 없으면 생성"""
     output_dir = "output"
@@ -20,18 +45,128 @@ def create_output_folder():
         print(f"'{output_dir}' 폴더를 생성했습니다.")
     return output_dir
 
+# 변경되지 않은 이미지를 건너뛰기 위한 기록 파일 (output 폴더 안에 저장)
+MANIFEST_NAME = ".manifest.json"
+# 처리한 파일이 이만큼 쌓일 때마다 처리 기록을 중간 저장
+MANIFEST_CHECKPOINT_EVERY = 50
+
+def load_manifest(output_dir):
+    """이전 실행에서 처리한 파일 기록을 읽음 (없거나 손상되면 빈 기록)"""
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        return manifest if isinstance(manifest, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(output_dir, manifest):
+    """처리 기록을 임시 파일에 쓴 뒤 교체 (중간에 중단돼도 기존 기록 보존)"""
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """파일 내용을 조금씩 읽어 SHA-256 해시 계산"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def is_unchanged(entry, input_path, output_path, settings):
+    """기록과 비교해 다시 처리할 필요가 없는지 확인
+
+    크기와 수정 시각이 같으면 바로 건너뛰고, 수정 시각만 바뀐 경우에는
+    내용 해시를 비교해서 실제로 같으면 건너뜀 (entry의 수정 시각은 갱신).
+    """
+    if not entry or entry.get("settings") != settings:
+        return False
+    if not os.path.exists(output_path):
+        return False
+    stat = os.stat(input_path)
+    if entry.get("size") != stat.st_size:
+        return False
+    if entry.get("mtime_ns") == stat.st_mtime_ns:
+        return True
+    if entry.get("sha256") == file_sha256(input_path):
+        entry["mtime_ns"] = stat.st_mtime_ns
+        return True
+    return False
+
+def make_manifest_entry(input_path, output_path, settings):
+    stat = os.stat(input_path)
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": file_sha256(input_path),
+        "output": os.path.basename(output_path),
+        "settings": settings,
+    }
+
+# 처리할 이미지 확장자 (소문자로 비교)
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.gif', '.webp', '.tiff'}
+
+def iter_image_files(root="images"):
+    """root 폴더를 하위 폴더까지 한 번만 훑으면서 이미지 경로를 하나씩 반환
+
+    디렉토리 목록을 다 읽기 전에도 찾은 파일을 바로 넘겨주므로 큰 폴더에서도
+    처리를 곧바로 시작할 수 있음. 폴더 심볼릭 링크는 따라가지 않고, 같은 파일을
+    가리키는 파일 심볼릭 링크는 한 번만 반환함.
+    """
+    seen = set()
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                        continue
+                    if os.path.splitext(entry.name)[1].lower() not in IMAGE_EXTENSIONS:
+                        continue
+                    if not entry.is_file():
+                        continue
+                    real_path = os.path.realpath(entry.path) if entry.is_symlink() else os.path.abspath(entry.path)
+                    key = os.path.normcase(real_path)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    yield entry.path
+        except OSError as e:
+            print(f"⚠ {directory} 폴더를 읽을 수 없습니다: {e}")
+
 def get_image_files():
     """images 폴더에서 모든 이미지 파일을 가져옴"""
-    image_extensions = ['*.jpg', '*.jpeg', '*.png', '*.bmp', '*.gif', '*.webp', '*.tiff']
-    image_files = []
-    
-    for ext in image_extensions:
-        image_files.extend(glob.glob(os.path.join("images", ext)))
-        image_files.extend(glob.glob(os.path.join("images", ext.upper())))
-    
-    return image_files
+    return list(iter_image_files("images"))
+
+# 흰색으로 판단할 RGB 채널 임계값 (각 채널이 이 값보다 커야 흰색으로 간주)
+DEFAULT_THRESHOLD = 240
+# 흰색 배경 픽셀을 대체할 투명 색상
+TRANSPARENT = (255, 255, 255, 0)
+
+def build_white_mask(img, threshold=DEFAULT_THRESHOLD):
+    """RGBA 이미지에서 흰색에 가까운 픽셀을 255, 나머지를 0으로 표시한 'L' 마스크 생성"""
+    if NUMPY_AVAILABLE:
+        rgb = np.asarray(img)[..., :3]
+        mask = np.all(rgb > threshold, axis=-1)
+        return Image.fromarray(mask.astype(np.uint8) * 255, 'L')
+
+    # numpy가 없으면 채널별 point 연산 후 곱해서 AND 마스크를 만듦 (0/255 값끼리의 곱)
+    lut = [255 if v > threshold else 0 for v in range(256)]
+    r, g, b, _ = img.split()
+    mask = ImageChops.multiply(r.point(lut), g.point(lut))
+    return ImageChops.multiply(mask, b.point(lut))
+
+def apply_white_to_transparent(img, threshold=DEFAULT_THRESHOLD):
+    """마스크 영역을 투명 색상으로 덮어씀 (img를 직접 수정)"""
+    img.paste(TRANSPARENT, mask=build_white_mask(img, threshold))
+    return img
 
-def simple_background_removal(input_path, output_path):
+def simple_background_removal(input_path, output_path, threshold=DEFAULT_THRESHOLD):
     """간단한 배경 제거 (흰색 배경을 투명하게)"""
     try:
         # 이미지 열기
@@ -41,20 +176,8 @@ def simple_background_removal(input_path, output_path):
         if img.mode != 'RGBA':
             img = img.convert('RGBA')
         
-        # 데이터 가져오기
-        data = img.getdata()
-        
-        # 새로운 데이터 생성 (흰색 배경을 투명하게)
-        new_data = []
-        for item in data:
-            # 흰색에 가까운 픽셀을 투명하게 처리
-            if item[0] > 240 and item[1] > 240 and item[2] > 240:
-                new_data.append((255, 255, 255, 0))  # 투명
-            else:
-                new_data.append(item)
-        
-        # 새로운 이미지 생성
-        img.putdata(new_data)
+        # 흰색에 가까운 픽셀을 투명하게 처리 (픽셀 단위 파이썬 루프 없이 마스크로 한 번에)
+        apply_white_to_transparent(img, threshold)
         
         # PNG로 저장
         img.save(output_path, 'PNG')
@@ -64,8 +187,196 @@ def simple_background_removal(input_path, output_path):
         print(f"✗ {os.path.basename(input_path)} 기본 처리 중 오류: {str(e)}")
         return False
 
-def remove_background_and_save(input_path, output_path):
-    """이미지의 배경을 제거하고 PNG로 저장"""
+# 타일 모드에서 이 픽셀 수를 넘는 이미지는 rembg 대신 스트립 단위 기본 처리 사용
+LARGE_IMAGE_PIXELS = 50_000_000
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+def _write_png_chunk(f, tag, data):
+    f.write(struct.pack(">I", len(data)))
+    f.write(tag)
+    f.write(data)
+    f.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(tag)) & 0xFFFFFFFF))
+
+def write_png_streaming(f, width, height, strips, compress_level=6):
+    """RGBA 스트립(바이트열)을 받아 PNG를 조금씩 기록
+
+    전체 이미지를 메모리에 모으지 않도록 각 행 앞에 필터 바이트(0)를 붙여
+    zlib으로 바로 압축하고, 압축된 데이터를 IDAT 청크로 내보냄.
+    """
+    stride = width * 4
+    f.write(PNG_SIGNATURE)
+    _write_png_chunk(f, b'IHDR', struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0))
+    compressor = zlib.compressobj(compress_level)
+    for raw in strips:
+        rows = bytearray()
+        for offset in range(0, len(raw), stride):
+            rows.append(0)
+            rows += raw[offset:offset + stride]
+        data = compressor.compress(bytes(rows))
+        if data:
+            _write_png_chunk(f, b'IDAT', data)
+    _write_png_chunk(f, b'IDAT', compressor.flush())
+    _write_png_chunk(f, b'IEND', b'')
+
+@contextmanager
+def allow_large_images():
+    """이 블록 안에서만 Pillow의 픽셀 수 제한(압축 폭탄 보호)을 해제"""
+    saved = Image.MAX_IMAGE_PIXELS
+    Image.MAX_IMAGE_PIXELS = None
+    try:
+        yield
+    finally:
+        Image.MAX_IMAGE_PIXELS = saved
+
+def is_large_image(input_path):
+    """헤더만 읽어서 타일 처리가 필요한 큰 이미지인지 확인"""
+    try:
+        with allow_large_images(), Image.open(input_path) as img:
+            width, height = img.size
+        return width * height > LARGE_IMAGE_PIXELS
+    except Exception:
+        return False
+
+def _strip_plan(img, tile_rows):
+    """
+    원본을 가로 조각별로 따로 읽을 계획 [(top, bottom, 파일 오프셋, raw 인자), ...]
+
+    폭 전체를 덮는 비압축(raw) 타일만 tile_rows 행씩 나눠 읽을 수 있음. 압축된
+    데이터(PNG, JPEG, 압축 TIFF 등)처럼 나눌 수 없으면 None.
+    """
+    width, height = img.size
+    tiles = sorted(img.tile, key=lambda tile: tile[1][1])
+    if not tiles or any(tile[0] != "raw" or tile[1][0] != 0 or tile[1][2] != width for tile in tiles):
+        return None
+    plan = []
+    for _, (_, top, _, bottom), offset, args in tiles:
+        args = args if isinstance(args, tuple) else (args,)
+        rawmode, stride, orientation = (tuple(args) + (0, 1)[len(args) - 1:])[:3]
+        if not stride:
+            if rawmode != img.mode:
+                return None
+            stride = len(Image.new(img.mode, (width, 1)).tobytes())
+        for start in range(top, bottom, tile_rows):
+            end = min(start + tile_rows, bottom)
+            # 아래에서 위로 저장된 데이터(BMP 등)는 파일 안의 행 순서가 반대
+            row = start - top if orientation >= 0 else bottom - end
+            plan.append((start, end, offset + row * stride, (rawmode, stride, orientation)))
+    return plan
+
+def exceeds_pixel_limit(size):
+    """Pillow가 압축 폭탄으로 보고 거부하는 크기(MAX_IMAGE_PIXELS의 2배 초과)인지 확인"""
+    limit = Image.MAX_IMAGE_PIXELS
+    return limit is not None and size[0] * size[1] > 2 * limit
+
+def iter_source_strips(input_path, img, plan, tile_rows):
+    """
+    원본 이미지를 위에서부터 가로 조각 이미지로 차례로 반환
+
+    plan이 있으면(비압축 원본) 조각마다 필요한 바이트만 파일에서 읽어 디코딩하고,
+    없으면 첫 crop에서 원본 전체가 한 번 디코딩됨.
+    """
+    width, height = img.size
+    if plan is None:
+        for top in range(0, height, tile_rows):
+            yield img.crop((0, top, width, min(top + tile_rows, height)))
+        return
+    with open(input_path, 'rb') as f:
+        for top, bottom, offset, args in plan:
+            f.seek(offset)
+            data = f.read((bottom - top) * args[1])
+            strip = Image.frombytes(img.mode, (width, bottom - top), data, "raw", *args)
+            if img.palette is not None:
+                strip.putpalette(img.getpalette())
+            yield strip
+
+def tiled_background_removal(input_path, output_path, threshold=DEFAULT_THRESHOLD, tile_rows=512):
+    """큰 이미지를 가로 스트립 단위로 처리하는 기본 배경 제거
+
+    RGBA 변환, 마스크, PNG 인코딩을 모두 tile_rows 행씩 처리함. 비압축 원본(비압축
+    TIFF, BMP, PPM 등)은 읽기도 스트립 단위라서 메모리가 스트립 몇 개 크기로 제한됨.
+    PNG·JPEG·압축 TIFF는 원본 전체를 한 번 디코딩해야 하므로 Pillow의 픽셀 수 제한을
+    그대로 적용하고, 넘으면 메모리 부족으로 죽는 대신 오류로 건너뜀.
+    """
+    tmp_path = output_path + ".part"
+    try:
+        # 헤더를 읽는 동안만 픽셀 수 제한을 풀고, 스트립 단위로 읽을 수 있는지 확인
+        with allow_large_images():
+            img = Image.open(input_path)
+        with img:
+            width, height = img.size
+            plan = _strip_plan(img, tile_rows)
+            if plan is None and exceeds_pixel_limit(img.size):
+                raise Image.DecompressionBombError(
+                    f"{img.format} 형식은 스트립 단위로 읽을 수 없어 {width}x{height} 이미지를 "
+                    "처리하지 않습니다 (비압축 TIFF/BMP/PPM으로 변환하면 타일 처리 가능)"
+                )
+            
+            def strips():
+                for strip in iter_source_strips(input_path, img, plan, tile_rows):
+                    if strip.mode != 'RGBA':
+                        strip = strip.convert('RGBA')
+                    apply_white_to_transparent(strip, threshold)
+                    yield strip.tobytes()
+            
+            with open(tmp_path, 'wb') as output_file:
+                write_png_streaming(output_file, width, height, strips())
+        os.replace(tmp_path, output_path)
+        print(f"✓ {os.path.basename(input_path)} -> {os.path.basename(output_path)} (타일 처리 {width}x{height})")
+        return True
+        
+    except Exception as e:
+        print(f"✗ {os.path.basename(input_path)} 타일 처리 중 오류: {str(e)}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+
+def _legacy_white_to_transparent(img, threshold=DEFAULT_THRESHOLD):
+    """이전 방식 (픽셀마다 파이썬 루프) - 벤치마크 및 결과 비교용"""
+    new_data = []
+    for item in img.getdata():
+        if item[0] > threshold and item[1] > threshold and item[2] > threshold:
+            new_data.append(TRANSPARENT)
+        else:
+            new_data.append(item)
+    img.putdata(new_data)
+    return img
+
+def benchmark_background_removal(image_files, threshold=DEFAULT_THRESHOLD, repeat=3):
+    """기존 루프 방식과 마스크 방식의 속도를 비교하고 결과가 동일한지 확인"""
+    engine = "numpy" if NUMPY_AVAILABLE else "Pillow"
+    print(f"=== 배경 제거 벤치마크 (마스크 엔진: {engine}, 임계값: {threshold}) ===")
+    for path in image_files:
+        source = Image.open(path).convert('RGBA')
+        timings = {}
+        results = {}
+        for name, func in (("loop", _legacy_white_to_transparent),
+                           ("mask", apply_white_to_transparent)):
+            best = None
+            for _ in range(repeat):
+                img = source.copy()
+                start = time.perf_counter()
+                func(img, threshold)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            timings[name] = best
+            results[name] = img.tobytes()
+
+        same = "동일" if results["loop"] == results["mask"] else "다름"
+        speedup = timings["loop"] / timings["mask"] if timings["mask"] else float('inf')
+        width, height = source.size
+        print(f"  - {os.path.basename(path)} ({width}x{height}): "
+              f"loop {timings['loop'] * 1000:.1f}ms, mask {timings['mask'] * 1000:.1f}ms "
+              f"→ {speedup:.1f}배, 결과 {same}")
+
+def remove_background_and_save(input_path, output_path, threshold=DEFAULT_THRESHOLD, tile_rows=0):
+    """이미지의 배경을 제거하고 PNG로 저장
+
+    tile_rows가 지정되면 LARGE_IMAGE_PIXELS보다 큰 이미지는 파일 전체를 메모리에
+    올리는 rembg 대신 스트립 단위 기본 배경 제거로 처리함.
+    """
+    if tile_rows and is_large_image(input_path):
+        return tiled_background_removal(input_path, output_path, threshold, tile_rows)
+    
     try:
         if REMBG_AVAILABLE:
             # rembg 사용
@@ -73,14 +384,14 @@ def remove_background_and_save(input_path, output_path):
                 input_data = input_file.read()
             
             # 배경 제거
-            output_data = remove(input_data)
+            output_data = remove(input_data, session=get_rembg_session())
             
             # PNG로 저장
             with open(output_path, 'wb') as output_file:
                 output_file.write(output_data)
         else:
             # 기본 배경 제거 방법 사용
-            return simple_background_removal(input_path, output_path)
+            return simple_background_removal(input_path, output_path, threshold)
         
         print(f"✓ {os.path.basename(input_path)} -> {os.path.basename(output_path)}")
         return True
@@ -90,10 +401,78 @@ def remove_background_and_save(input_path, output_path):
         # rembg 실패 시 기본 방법 시도
         if REMBG_AVAILABLE:
             print(f"  → 기본 방법으로 재시도...")
-            return simple_background_removal(input_path, output_path)
+            return simple_background_removal(input_path, output_path, threshold)
         return False
 
+def _init_worker():
+    """워커 프로세스 시작 시 rembg 모델을 미리 로드"""
+    if REMBG_AVAILABLE:
+        get_rembg_session()
+
+def _process_job(job):
+    """워커에서 실행되는 단일 작업: (입력 경로, 출력 경로, 임계값, 타일 행 수)"""
+    input_path, output_path, threshold, tile_rows = job
+    return remove_background_and_save(input_path, output_path, threshold, tile_rows)
+
+def process_images(jobs, workers=1):
+    """(태그, 작업) 쌍을 받아 입력 순서대로 (태그, 성공 여부)를 하나씩 반환
+
+    jobs는 제너레이터여도 되며, 병렬 모드에서는 워커 수의 몇 배만큼만 미리
+    제출해서 목록 전체를 기다리지 않고 바로 처리를 시작함.
+    """
+    if workers <= 1:
+        for i, (tag, job) in enumerate(jobs, 1):
+            print(f"[{i}] {os.path.basename(job[0])} 처리 중...")
+            yield tag, _process_job(job)
+        return
+
+    print(f"⚙ {workers}개의 프로세스로 병렬 처리합니다.")
+    max_in_flight = workers * 4
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        in_flight = deque()
+        done_count = 0
+        jobs = iter(jobs)
+        while True:
+            for tag, job in jobs:
+                in_flight.append((tag, job, executor.submit(_process_job, job)))
+                if len(in_flight) >= max_in_flight:
+                    break
+            if not in_flight:
+                break
+            # 가장 먼저 제출한 작업부터 기다려서 입력 순서를 유지
+            tag, job, future = in_flight.popleft()
+            ok = future.result()
+            done_count += 1
+            print(f"[{done_count}] {os.path.basename(job[0])} {'완료' if ok else '실패'}")
+            yield tag, ok
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="이미지 배경 제거 및 PNG 변환 프로그램")
+    parser.add_argument("--threshold", type=int, default=DEFAULT_THRESHOLD,
+                        help=f"기본 배경 제거에서 흰색으로 볼 RGB 임계값 (0~255, 기본값 {DEFAULT_THRESHOLD})")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="기존 루프 방식과 마스크 방식의 속도를 비교만 하고 종료")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="병렬로 사용할 프로세스 수 (기본값 1, 0이면 CPU 코어 수)")
+    parser.add_argument("--tile-rows", type=int, default=0,
+                        help=f"{LARGE_IMAGE_PIXELS:,}픽셀보다 큰 이미지를 이 행 수만큼씩 나눠 처리 (기본값 0: 사용 안 함). "
+                             "비압축 TIFF/BMP/PPM은 스트립 단위로 디코딩함. PNG, JPEG, 압축 TIFF는 "
+                             "원본 전체를 디코딩해야 하므로 Pillow 픽셀 수 제한을 넘으면 건너뜀")
+    parser.add_argument("--force", action="store_true",
+                        help="변경되지 않은 이미지도 모두 다시 처리")
+    args = parser.parse_args()
+    if not 0 <= args.threshold <= 255:
+        parser.error("--threshold 값은 0~255 사이여야 합니다.")
+    if args.tile_rows < 0:
+        parser.error("--tile-rows 값은 0 이상이어야 합니다.")
+    if args.workers < 0:
+        parser.error("--workers 값은 0 이상이어야 합니다.")
+    if args.workers == 0:
+        args.workers = os.cpu_count() or 1
+    return args
+
 def main():
+    args = parse_args()
     print("=== 이미지 배경 제거 및 PNG 변환 프로그램 ===")
     print()
     
@@ -109,37 +488,64 @@ def main():
         print("2. output 폴더 생성 중...")
         output_dir = create_output_folder()
         
-        # 이미지 파일 목록 가져오기
-        print("3. 이미지 파일 검색 중...")
-        image_files = get_image_files()
-        
-        if not image_files:
-            print("❌ images 폴더에서 이미지 파일을 찾을 수 없습니다.")
+        if args.benchmark:
+            image_files = get_image_files()
+            if not image_files:
+                print("❌ images 폴더에서 이미지 파일을 찾을 수 없습니다.")
+                return
+            benchmark_background_removal(image_files, args.threshold)
             return
         
-        print(f"📁 {len(image_files)}개의 이미지 파일을 찾았습니다:")
-        for img in image_files:
-            print(f"  - {os.path.basename(img)}")
-        print()
+        # 출력 결과에 영향을 주는 설정 (바뀌면 모든 파일을 다시 처리)
+        settings = {"rembg": REMBG_AVAILABLE, "threshold": args.threshold, "tile_rows": args.tile_rows}
+        previous = {} if args.force else load_manifest(output_dir)
+        manifest = {}
+        counts = {"found": 0, "skipped": 0}
+        
+        def pending_jobs():
+            """폴더를 훑으면서 처리할 작업을 바로 넘김 (변경되지 않은 이미지는 건너뜀)"""
+            for input_path in iter_image_files("images"):
+                counts["found"] += 1
+                key = os.path.relpath(input_path, "images")
+                # 출력 파일명 생성 (하위 폴더 구조 유지, 원본 파일명 + .png)
+                output_path = os.path.join(output_dir, os.path.splitext(key)[0] + ".png")
+                
+                entry = previous.get(key)
+                if is_unchanged(entry, input_path, output_path, settings):
+                    manifest[key] = entry
+                    counts["skipped"] += 1
+                    continue
+                os.makedirs(os.path.dirname(output_path), exist_ok=True)
+                yield (key, input_path, output_path), (input_path, output_path, args.threshold, args.tile_rows)
         
-        # 각 이미지 처리
+        # 이미지 검색과 배경 제거를 함께 진행
+        print("3. 이미지 파일 검색 및 처리 중...")
         success_count = 0
-        total_count = len(image_files)
+        total_count = 0
+        completed = False
+        try:
+            for (key, input_path, output_path), ok in process_images(pending_jobs(), args.workers):
+                total_count += 1
+                if ok:
+                    success_count += 1
+                    manifest[key] = make_manifest_entry(input_path, output_path, settings)
+                if total_count % MANIFEST_CHECKPOINT_EVERY == 0:
+                    # 중간 저장: 아직 확인하지 않은 이전 기록도 남겨서 다음 실행이 이어서 건너뛰게 함
+                    save_manifest(output_dir, {**previous, **manifest})
+            completed = True
+        finally:
+            # 끝까지 돌았으면 지금 있는 파일만 기록하고, 중단됐으면 이전 기록과 합쳐서 저장
+            save_manifest(output_dir, manifest if completed else {**previous, **manifest})
         
-        for i, input_path in enumerate(image_files, 1):
-            print(f"[{i}/{total_count}] 처리 중...")
-            
-            # 출력 파일명 생성 (원본 파일명 + .png)
-            filename = os.path.splitext(os.path.basename(input_path))[0]
-            output_path = os.path.join(output_dir, f"{filename}.png")
-            
-            # 배경 제거 및 저장
-            if remove_background_and_save(input_path, output_path):
-                success_count += 1
+        if counts["found"] == 0:
+            print("❌ images 폴더에서 이미지 파일을 찾을 수 없습니다.")
+            return
         
         print()
         print("=== 처리 완료 ===")
         print(f"✅ 성공: {success_count}/{total_count}개 파일")
+        if counts["skipped"]:
+            print(f"⏭ 건너뜀: {counts['skipped']}개 파일 (변경 없음, --force로 전체 재처리)")
         print(f"📁 출력 폴더: {os.path.abspath(output_dir)}")
         
         if success_count < total_count:
@@ -1,25 +1,84 @@
-from flask import Flask, render_template, request, jsonify, send_file, flash, redirect, url_for
+from flask import Flask, render_template, request, jsonify, send_file, flash, redirect, url_for, Response, stream_with_context
+import atexit
 import os
+import io
+import json
+import shutil
 import yt_dlp
 import tempfile
 import threading
 import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from urllib.parse import urlparse, parse_qs
 import re
 
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-here'
 
-# 다운로드 진행 상황을 저장할 딕셔너리
-download_progress = {}
+# 동시에 실행할 다운로드 수와 대기열에 쌓을 수 있는 최대 작업 수
+DOWNLOAD_WORKERS = 2
+MAX_PENDING_JOBS = 8
+
+# 다운로드는 요청 처리 스레드가 아닌 백그라운드 워커에서 실행
+download_executor = ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS, thread_name_prefix='download')
+
+# 작업 ID별 다운로드 상태와 진행 상황
+download_jobs = {}
+jobs_lock = threading.Lock()
+# 작업 상태가 바뀌면 SSE 스트림에 알림
+jobs_changed = threading.Condition(jobs_lock)
+
+# 진행률 갱신 최소 간격(초): 초당 몇 번만 이벤트를 보냄
+PROGRESS_INTERVAL = 0.25
+# 끝난 작업(완료/오류)을 목록에서 지우기까지의 시간(초)
+FINISHED_JOB_TTL = 600
+# SSE 연결 유지를 위한 주석 전송 간격(초)
+SSE_KEEPALIVE = 15
+
+# 다운로드 파일을 모아 두는 임시 폴더와 용량 제한
+# 저장소 기록은 메모리에만 있으므로 프로세스마다 새 폴더를 만들고 종료할 때 지움
+# (재시작 전에 받은 파일이 기록 없이 남아 용량만 차지하지 않도록)
+DOWNLOAD_ROOT = tempfile.mkdtemp(prefix='yt_downloads_')
+atexit.register(shutil.rmtree, DOWNLOAD_ROOT, ignore_errors=True)
+DOWNLOAD_QUOTA_BYTES = 5 * 1024 ** 3
+MIN_FREE_BYTES = 1024 ** 3
+# 파일 전송이 끝난 뒤 이어받기(Range 요청)를 위해 파일을 남겨 두는 시간(초)
+RESUME_GRACE = 120
+
+# 같은 (동영상 ID, 포맷) 파일을 한 번만 받아 여러 사용자가 함께 쓰는 공유 저장소
+# 참조하는 작업이 없는 파일은 합계가 STORE_MAX_BYTES를 넘으면 오래 안 쓴 것부터 삭제
+STORE_MAX_BYTES = 4 * 1024 ** 3
+download_store = OrderedDict()
+
+# 동영상 정보 캐시: 같은 동영상은 INFO_CACHE_TTL초 동안 다시 조회하지 않음
+INFO_CACHE_TTL = 600
+INFO_CACHE_SIZE = 256
+info_cache = OrderedDict()
+# 조회 중인 동영상 ID별 대기 정보 (같은 동영상 동시 요청은 한 번만 조회)
+info_inflight = {}
+info_lock = threading.Lock()
+
+YOUTUBE_REGEX = re.compile(
+    r'(https?://)?(www\.)?(youtube|youtu|youtube-nocookie)\.(com|be)/'
+    r'(watch\?v=|embed/|v/|.+\?v=)?([^&=%\?]{11})'
+)
+# 캐시 키로 쓸 동영상 ID를 뽑는 패턴 (watch, youtu.be, embed, v, shorts, live 주소)
+VIDEO_ID_REGEX = re.compile(
+    r'(?:https?://)?(?:www\.|m\.)?(?:youtube(?:-nocookie)?\.com|youtu\.be)/'
+    r'(?:watch\?(?:[^#]*&)?v=|embed/|v/|shorts/|live/)?([A-Za-z0-9_-]{11})(?![A-Za-z0-9_-])'
+)
 
 def is_valid_youtube_url(url):
     """유튜브 URL이 유효한지 확인"""
-    youtube_regex = re.compile(
-        r'(https?://)?(www\.)?(youtube|youtu|youtube-nocookie)\.(com|be)/'
-        r'(watch\?v=|embed/|v/|.+\?v=)?([^&=%\?]{11})'
-    )
-    return youtube_regex.match(url) is not None
+    return YOUTUBE_REGEX.match(url) is not None
+
+def extract_video_id(url):
+    """유튜브 URL에서 11자리 동영상 ID 추출 (알 수 없는 형태의 주소면 None)"""
+    match = VIDEO_ID_REGEX.match(url)
+    return match.group(1) if match else None
 
 def get_video_info(url):
     """동영상 정보 가져오기"""
@@ -52,23 +111,262 @@ def get_video_info(url):
     except Exception as e:
         return None
 
-def progress_hook(d):
-    """다운로드 진행 상황 업데이트"""
+def _set_job(job, fields):
+    """작업 상태 갱신 (jobs_lock을 잡은 상태에서 호출, 알림은 호출한 쪽에서)"""
+    job.update(fields)
+    job['version'] += 1
+    job['updated_at'] = time.time()
+    if fields.get('status') in ('finished', 'error'):
+        job['finished_at'] = job['updated_at']
+        job['expires_at'] = job['updated_at'] + FINISHED_JOB_TTL
+
+def update_job(job_id, **fields):
+    """작업 상태를 잠금 안에서 갱신하고 기다리는 SSE 스트림을 깨움"""
+    with jobs_changed:
+        job = download_jobs.get(job_id)
+        if job is not None:
+            _set_job(job, fields)
+            jobs_changed.notify_all()
+
+def update_store_jobs(key, **fields):
+    """공유 다운로드 하나를 기다리는 모든 작업의 상태를 함께 갱신"""
+    with jobs_changed:
+        entry = download_store.get(key)
+        if entry is None:
+            return
+        entry['progress'].update(fields)
+        entry['updated_at'] = time.time()
+        for job_id in entry['waiting']:
+            job = download_jobs.get(job_id)
+            if job is not None:
+                _set_job(job, fields)
+        jobs_changed.notify_all()
+
+def public_job(job):
+    """클라이언트에 보여줄 작업 정보 (서버 내부 경로 제외)"""
+    return {key: value for key, value in job.items()
+            if key not in ('url', 'file_path', 'store_key', 'expires_at')}
+
+def evict_store_entries(max_bytes=None):
+    """
+    참조하는 작업이 없는 공유 파일을 오래 안 쓴 순서로 저장소에서 빼기 (jobs_lock 안에서 호출)
+
+    완료된 파일 크기 합이 max_bytes(기본값 STORE_MAX_BYTES) 이하가 될 때까지 빼고, 지울 폴더 목록을 반환함.
+    실제 삭제는 잠금 밖에서 remove_dirs로 처리.
+    """
+    if max_bytes is None:
+        max_bytes = STORE_MAX_BYTES
+    total = sum(entry['size'] for entry in download_store.values() if entry['status'] == 'ready')
+    removed = []
+    for key, entry in list(download_store.items()):
+        if total <= max_bytes:
+            break
+        if entry['status'] == 'ready' and entry['refs'] == 0:
+            del download_store[key]
+            total -= entry['size']
+            removed.append(entry['dir'])
+    return removed
+
+def remove_dirs(dirs):
+    for directory in dirs:
+        if directory:
+            shutil.rmtree(directory, ignore_errors=True)
+
+def cleanup_jobs():
+    """
+    보관 기한(expires_at)이 지난 끝난 작업을 목록에서 지우고 공유 파일 참조를 해제
+
+    기한은 작업이 끝나면 FINISHED_JOB_TTL초, 파일 전송이 끝나면 RESUME_GRACE초로 정해짐.
+    참조가 모두 풀린 파일은 저장소 용량(STORE_MAX_BYTES)을 넘을 때만 삭제됨.
+    """
+    now = time.time()
+    with jobs_lock:
+        expired = [job_id for job_id, job in download_jobs.items()
+                   if job.get('expires_at') and job['expires_at'] < now]
+        for job_id in expired:
+            entry = download_store.get(download_jobs.pop(job_id).get('store_key'))
+            if entry is not None:
+                entry['refs'] -= 1
+        removed = evict_store_entries()
+    remove_dirs(removed)
+
+def download_area_usage():
+    """임시 다운로드 폴더 전체 크기(바이트, 받는 중인 .part 파일 포함)"""
+    total = 0
+    for directory, _, files in os.walk(DOWNLOAD_ROOT):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(directory, name))
+            except OSError:
+                pass
+    return total
+
+def has_download_space():
+    """
+    임시 폴더 용량 제한과 디스크 여유 공간을 확인
+
+    공간이 모자라면 참조 중이 아닌 공유 파일을 모두 지운 뒤 한 번 더 확인함.
+    """
+    def enough():
+        if shutil.disk_usage(DOWNLOAD_ROOT).free < MIN_FREE_BYTES:
+            return False
+        return download_area_usage() < DOWNLOAD_QUOTA_BYTES
+    
+    if enough():
+        return True
+    with jobs_lock:
+        removed = evict_store_entries(0)
+    remove_dirs(removed)
+    return bool(removed) and enough()
+
+class ReleasingFile(io.BufferedReader):
+    """
+    응답 전송이 끝나 WSGI 서버가 파일을 닫을 때 on_close를 호출하는 파일 객체
+
+    fileno()가 있는 실제 파일이므로 서버가 sendfile로 바로 보낼 수 있음.
+    """
+    
+    def __init__(self, path, on_close):
+        super().__init__(io.FileIO(path, 'rb'))
+        self._on_close = on_close
+    
+    def close(self):
+        if not self.closed:
+            super().close()
+            self._on_close()
+
+def schedule_release(job_id):
+    """파일 전송이 끝난 작업을 RESUME_GRACE초 뒤에 정리하도록 예약"""
+    with jobs_lock:
+        job = download_jobs.get(job_id)
+        if job is not None:
+            job['expires_at'] = time.time() + RESUME_GRACE
+    timer = threading.Timer(RESUME_GRACE + 1, cleanup_jobs)
+    timer.daemon = True
+    timer.start()
+
+def get_video_info_cached(url):
+    """
+    동영상 ID 기준 TTL+LRU 캐시를 거쳐 동영상 정보를 가져오기
+
+    캐시에는 get_video_info가 정리한 결과(필요한 포맷 필드만)를 저장하고, 같은 동영상을
+    동시에 요청하면 첫 요청만 yt_dlp로 조회하고 나머지는 그 결과를 기다림.
+    """
+    video_id = extract_video_id(url)
+    if video_id is None:
+        # ID를 알 수 없는 주소는 캐시 없이 원래 주소로 조회
+        return get_video_info(url)
+    
+    with info_lock:
+        cached = info_cache.get(video_id)
+        if cached and cached[0] > time.time():
+            info_cache.move_to_end(video_id)
+            return cached[1]
+        waiter = info_inflight.get(video_id)
+        is_leader = waiter is None
+        if is_leader:
+            waiter = {'event': threading.Event(), 'info': None}
+            info_inflight[video_id] = waiter
+    
+    if not is_leader:
+        waiter['event'].wait()
+        return waiter['info']
+    
+    info = None
+    try:
+        info = get_video_info(f'https://www.youtube.com/watch?v={video_id}')
+    finally:
+        with info_lock:
+            if info is not None:
+                info_cache[video_id] = (time.time() + INFO_CACHE_TTL, info)
+                info_cache.move_to_end(video_id)
+                while len(info_cache) > INFO_CACHE_SIZE:
+                    info_cache.popitem(last=False)
+            info_inflight.pop(video_id, None)
+        waiter['info'] = info
+        waiter['event'].set()
+    return info
+
+def progress_hook(key, d):
+    """다운로드 진행 상황 업데이트 (PROGRESS_INTERVAL마다 한 번만 반영)"""
     if d['status'] == 'downloading':
-        if 'total_bytes' in d:
-            percent = (d['downloaded_bytes'] / d['total_bytes']) * 100
-            download_progress[d['filename']] = {
-                'status': 'downloading',
-                'percent': round(percent, 2),
-                'speed': d.get('speed', 0),
-                'eta': d.get('eta', 0)
-            }
+        total = d.get('total_bytes') or d.get('total_bytes_estimate')
+        with jobs_lock:
+            entry = download_store.get(key)
+            throttled = entry is None or time.time() - entry['updated_at'] < PROGRESS_INTERVAL
+        if total and not throttled:
+            percent = (d['downloaded_bytes'] / total) * 100
+            update_store_jobs(key,
+                              status='downloading',
+                              percent=round(percent, 2),
+                              speed=d.get('speed', 0),
+                              eta=d.get('eta', 0))
     elif d['status'] == 'finished':
-        download_progress[d['filename']] = {
-            'status': 'finished',
-            'percent': 100,
-            'filename': d['filename']
-        }
+        # 파일 받기가 끝나도 병합/후처리가 남아 있을 수 있으므로 100%만 표시
+        update_store_jobs(key, percent=100)
+
+def finish_store_entry(key, file_path):
+    """공유 다운로드 완료: 기다리던 작업을 모두 완료로 바꾸고 용량 초과분 정리"""
+    fields = {'status': 'finished', 'percent': 100, 'filename': os.path.basename(file_path),
+              'file_path': file_path}
+    size = os.path.getsize(file_path)
+    with jobs_changed:
+        entry = download_store[key]
+        entry.update(status='ready', file_path=file_path, filename=fields['filename'], size=size)
+        for job_id in entry['waiting']:
+            job = download_jobs.get(job_id)
+            if job is not None:
+                _set_job(job, fields)
+        entry['waiting'].clear()
+        jobs_changed.notify_all()
+        removed = evict_store_entries()
+    remove_dirs(removed)
+
+def fail_store_entry(key, error):
+    """공유 다운로드 실패: 기다리던 작업을 모두 오류로 바꾸고 항목 제거 (다음 요청은 새로 받음)"""
+    with jobs_changed:
+        entry = download_store.pop(key)
+        for job_id in entry['waiting']:
+            job = download_jobs.get(job_id)
+            if job is not None:
+                job.pop('store_key', None)
+                _set_job(job, {'status': 'error', 'error': error})
+        jobs_changed.notify_all()
+
+def run_store_download(key):
+    """백그라운드 워커에서 공유 저장소 항목 하나를 실제로 다운로드"""
+    with jobs_lock:
+        entry = download_store[key]
+        url, format_id = entry['url'], entry['format_id']
+    update_store_jobs(key, status='downloading')
+    
+    # 항목별 임시 디렉토리 (저장소에서 빠질 때 함께 삭제)
+    temp_dir = tempfile.mkdtemp(dir=DOWNLOAD_ROOT)
+    with jobs_lock:
+        entry['dir'] = temp_dir
+    ydl_opts = {
+        'outtmpl': os.path.join(temp_dir, '%(title)s.%(ext)s'),
+        'progress_hooks': [partial(progress_hook, key)],
+        'format': format_id,
+        'quiet': True,
+        'no_warnings': True,
+    }
+    
+    try:
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(url, download=True)
+            # yt-dlp가 알려주는 최종 파일 경로 사용 (병합 후 확장자가 바뀐 경우 포함)
+            downloads = info.get('requested_downloads') or [{}]
+            file_path = downloads[0].get('filepath') or ydl.prepare_filename(info)
+        
+        if os.path.isfile(file_path):
+            finish_store_entry(key, file_path)
+            return
+        fail_store_entry(key, '다운로드된 파일을 찾을 수 없습니다.')
+    except Exception as e:
+        fail_store_entry(key, f'다운로드 중 오류가 발생했습니다: {str(e)}')
+    # 실패한 다운로드의 임시 파일은 바로 삭제
+    shutil.rmtree(temp_dir, ignore_errors=True)
 
 @app.route('/')
 def index():
@@ -84,7 +382,7 @@ def get_video_info_route():
     if not is_valid_youtube_url(url):
         return jsonify({'error': '유효한 유튜브 URL을 입력해주세요.'}), 400
     
-    info = get_video_info(url)
+    info = get_video_info_cached(url)
     if not info:
         return jsonify({'error': '동영상 정보를 가져올 수 없습니다.'}), 400
     
@@ -92,42 +390,155 @@ def get_video_info_route():
 
 @app.route('/download', methods=['POST'])
 def download_video():
+    """
+    다운로드 작업을 만들고 작업 ID를 바로 반환
+
+    같은 (동영상 ID, 포맷) 파일은 공유 저장소에서 한 번만 받음: 이미 받아 둔 파일이면
+    작업이 곧바로 완료 상태가 되고, 받는 중이면 그 다운로드에 함께 붙어서 기다림.
+    """
     url = request.json.get('url', '').strip()
     format_id = request.json.get('format_id', 'best')
     
     if not url or not is_valid_youtube_url(url):
         return jsonify({'error': '유효한 유튜브 URL을 입력해주세요.'}), 400
     
-    # 임시 디렉토리 생성
-    temp_dir = tempfile.mkdtemp()
+    video_id = extract_video_id(url)
+    key = (video_id or url, format_id)
     
-    ydl_opts = {
-        'outtmpl': os.path.join(temp_dir, '%(title)s.%(ext)s'),
-        'progress_hooks': [progress_hook],
-        'format': format_id,
-    }
+    cleanup_jobs()
+    with jobs_lock:
+        needs_download = key not in download_store
+    if needs_download and not has_download_space():
+        return jsonify({'error': '서버의 임시 저장 공간이 부족합니다. 잠시 후 다시 시도해주세요.'}), 507
     
-    try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=True)
-            filename = ydl.prepare_filename(info)
-            
-            # 실제 다운로드된 파일 찾기
-            for file in os.listdir(temp_dir):
-                if file.endswith(('.mp4', '.webm', '.mkv', '.avi')):
-                    file_path = os.path.join(temp_dir, file)
-                    return send_file(file_path, as_attachment=True, download_name=file)
-            
-            return jsonify({'error': '다운로드된 파일을 찾을 수 없습니다.'}), 400
-            
-    except Exception as e:
-        return jsonify({'error': f'다운로드 중 오류가 발생했습니다: {str(e)}'}), 500
+    job_id = uuid.uuid4().hex
+    with jobs_changed:
+        entry = download_store.get(key)
+        is_new = entry is None
+        if is_new:
+            pending = sum(1 for item in download_store.values() if item['status'] != 'ready')
+            if pending >= MAX_PENDING_JOBS:
+                return jsonify({'error': '대기 중인 다운로드가 너무 많습니다. 잠시 후 다시 시도해주세요.'}), 429
+            entry = {
+                # 첫 요청의 주소를 그대로 사용 (shorts/live 등 주소 형태는 yt-dlp가 처리)
+                'url': url,
+                'format_id': format_id,
+                'status': 'queued',
+                'progress': {'status': 'queued', 'percent': 0},
+                'updated_at': 0,
+                'waiting': set(),
+                'refs': 0,
+                'dir': None,
+                'size': 0,
+            }
+            download_store[key] = entry
+        download_store.move_to_end(key)
+        # 작업이 정리될 때까지 파일이 지워지지 않도록 참조 유지
+        entry['refs'] += 1
+        job = {
+            'job_id': job_id,
+            'url': url,
+            'format_id': format_id,
+            'store_key': key,
+            'status': 'queued',
+            'percent': 0,
+            'created_at': time.time(),
+            'updated_at': 0,
+            'version': 0,
+        }
+        download_jobs[job_id] = job
+        if entry['status'] == 'ready':
+            _set_job(job, {'status': 'finished', 'percent': 100, 'filename': entry['filename'],
+                           'file_path': entry['file_path'], 'shared': True})
+        else:
+            entry['waiting'].add(job_id)
+            _set_job(job, dict(entry['progress'], shared=not is_new))
+        status = job['status']
+    
+    if is_new:
+        download_executor.submit(run_store_download, key)
+    return jsonify({'job_id': job_id, 'status': status}), 202
 
-@app.route('/progress/<filename>')
-def get_progress(filename):
+@app.route('/progress/<job_id>')
+def get_progress(job_id):
     """다운로드 진행 상황 조회"""
-    progress = download_progress.get(filename, {'status': 'not_found'})
-    return jsonify(progress)
+    with jobs_lock:
+        job = download_jobs.get(job_id)
+        progress = public_job(job) if job else {'status': 'not_found'}
+    return jsonify(progress), (200 if job else 404)
+
+@app.route('/progress/<job_id>/stream')
+def stream_progress(job_id):
+    """다운로드 진행 상황을 Server-Sent Events로 전송 (완료/오류 시 스트림 종료)"""
+    with jobs_lock:
+        if job_id not in download_jobs:
+            return jsonify({'status': 'not_found'}), 404
+    
+    def events():
+        last_version = -1
+        while True:
+            # 잠금 안에서는 상태만 복사하고, 소켓 쓰기(yield)는 잠금을 놓은 뒤에 함
+            with jobs_changed:
+                job = download_jobs.get(job_id)
+                if job is not None and job['version'] == last_version:
+                    jobs_changed.wait_for(
+                        lambda: download_jobs.get(job_id, {}).get('version') != last_version,
+                        timeout=SSE_KEEPALIVE)
+                    job = download_jobs.get(job_id)
+                if job is None:
+                    data = None
+                elif job['version'] == last_version:
+                    data = {}
+                else:
+                    last_version = job['version']
+                    data = public_job(job)
+            if data is None:
+                yield 'event: error\ndata: {"status": "not_found"}\n\n'
+                return
+            if not data:
+                yield ': keep-alive\n\n'
+                continue
+            yield f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+            if data['status'] in ('finished', 'error'):
+                return
+    
+    headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    return Response(stream_with_context(events()), mimetype='text/event-stream', headers=headers)
+
+@app.route('/file/<job_id>')
+def get_file(job_id):
+    """
+    완료된 다운로드 파일 전송
+
+    파일을 메모리에 올리지 않고 그대로 스트리밍(가능하면 sendfile)하며, Range 요청을
+    지원해서 끊긴 다운로드를 이어받을 수 있음. 전송이 끝나면 RESUME_GRACE초 뒤에
+    작업을 정리하고 공유 파일 참조를 해제함.
+    """
+    with jobs_lock:
+        job = download_jobs.get(job_id)
+        job = dict(job) if job else None
+        if job and job['status'] == 'finished':
+            # 전송 중에는 정리되지 않도록 기한 연장
+            download_jobs[job_id]['expires_at'] = time.time() + FINISHED_JOB_TTL
+            if job.get('store_key') in download_store:
+                download_store.move_to_end(job['store_key'])
+    
+    if not job:
+        return jsonify({'error': '다운로드 작업을 찾을 수 없습니다.'}), 404
+    if job['status'] != 'finished':
+        return jsonify({'error': '아직 다운로드가 완료되지 않았습니다.', 'status': job['status']}), 409
+    if not os.path.isfile(job['file_path']):
+        return jsonify({'error': '다운로드 파일이 이미 삭제되었습니다.'}), 410
+    
+    stat = os.stat(job['file_path'])
+    file = ReleasingFile(job['file_path'], partial(schedule_release, job_id))
+    response = send_file(file, as_attachment=True, download_name=job['filename'],
+                         conditional=False, etag=False)
+    response.content_length = stat.st_size
+    response.last_modified = stat.st_mtime
+    response.set_etag(f"{job_id}-{stat.st_mtime_ns}-{stat.st_size}")
+    # Range/If-None-Match 요청 처리 (이어받기 지원)
+    return response.make_conditional(request.environ, accept_ranges=True, complete_length=stat.st_size)
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -1,10 +1,499 @@
-from flask import Flask, render_template, request, jsonify, session
+from flask import Flask, Response, render_template, request, jsonify, session, stream_with_context
 from flask_cors import CORS
+from abc import ABC, abstractmethod
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+import argparse
+import asyncio
+import json
+import math
 import os
+import random
+import re
+import sqlite3
+import string
+import sys
+import threading
+import time
+import uuid
+from io import BytesIO
+from urllib.parse import unquote
 
+from itsdangerous import BadSignature
 
-def create_app() -> Flask:
+# Optional: aiohttp serves /api/chat/stream on an event loop (--server aiohttp)
+try:
+    from aiohttp import web
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+
+# Origins allowed to call /api/* during development (Live Server on 127.0.0.1:5500)
+CORS_ORIGINS = ["http://127.0.0.1:5500", "http://localhost:5500"]
+
+
+# Only the most recent messages of each conversation are kept
+MAX_HISTORY_MESSAGES = 50
+# Conversations kept by the in-memory store before the least recently used is dropped
+MAX_SESSIONS = 10000
+
+
+class HistoryStore(ABC):
+    """Server-side chat history keyed by session ID, windowed to ``max_messages``."""
+
+    def __init__(self, max_messages: int = MAX_HISTORY_MESSAGES) -> None:
+        self.max_messages = max_messages
+
+    @abstractmethod
+    def get(self, session_id: str) -> List[dict]:
+        ...
+
+    @abstractmethod
+    def append(self, session_id: str, messages: List[dict]) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self, session_id: str) -> None:
+        ...
+
+
+class MemoryHistoryStore(HistoryStore):
+    def __init__(self, max_messages: int = MAX_HISTORY_MESSAGES, max_sessions: int = MAX_SESSIONS) -> None:
+        super().__init__(max_messages)
+        self.max_sessions = max_sessions
+        self.histories: "OrderedDict[str, List[dict]]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, session_id: str) -> List[dict]:
+        with self.lock:
+            history = self.histories.get(session_id)
+            if history is None:
+                return []
+            self.histories.move_to_end(session_id)
+            return list(history)
+
+    def append(self, session_id: str, messages: List[dict]) -> None:
+        with self.lock:
+            history = self.histories.setdefault(session_id, [])
+            history.extend(messages)
+            del history[:-self.max_messages]
+            self.histories.move_to_end(session_id)
+            while len(self.histories) > self.max_sessions:
+                self.histories.popitem(last=False)
+
+    def clear(self, session_id: str) -> None:
+        with self.lock:
+            self.histories.pop(session_id, None)
+
+
+class SqliteHistoryStore(HistoryStore):
+    """History persisted in a SQLite file, shared by request threads behind a lock."""
+
+    def __init__(self, path: str, max_messages: int = MAX_HISTORY_MESSAGES) -> None:
+        super().__init__(max_messages)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock, self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS messages ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, session_id TEXT NOT NULL, "
+                "role TEXT NOT NULL, content TEXT NOT NULL)"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS messages_session ON messages (session_id, id)"
+            )
+
+    def get(self, session_id: str) -> List[dict]:
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT role, content FROM messages WHERE session_id = ? ORDER BY id",
+                (session_id,),
+            ).fetchall()
+        return [{"role": role, "content": content} for role, content in rows]
+
+    def append(self, session_id: str, messages: List[dict]) -> None:
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "INSERT INTO messages (session_id, role, content) VALUES (?, ?, ?)",
+                [(session_id, m["role"], m["content"]) for m in messages],
+            )
+            # Drop everything older than the newest max_messages rows
+            self.connection.execute(
+                "DELETE FROM messages WHERE session_id = ? AND id <= ("
+                "SELECT id FROM messages WHERE session_id = ? ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                (session_id, session_id, self.max_messages),
+            )
+
+    def clear(self, session_id: str) -> None:
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+
+
+INTENTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "intents.json")
+
+
+class IntentMatcher:
+    """Aho-Corasick automaton over the keywords of every intent.
+
+    Intents are ranked by ``priority`` (higher first, then file order). Each state
+    stores the best rank among keywords ending there or at its fail-link suffixes,
+    so a message is matched in one pass no matter how many rules are loaded.
+    """
+
+    def __init__(self, intents: List[dict]) -> None:
+        self.intents = sorted(intents, key=lambda intent: -intent.get("priority", 0))
+        no_match = len(self.intents)
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.best: List[int] = [no_match]
+
+        for rank, intent in enumerate(self.intents):
+            for keyword in intent["keywords"]:
+                state = 0
+                for char in keyword.lower():
+                    next_state = self.goto[state].get(char)
+                    if next_state is None:
+                        next_state = len(self.goto)
+                        self.goto.append({})
+                        self.fail.append(0)
+                        self.best.append(no_match)
+                        self.goto[state][char] = next_state
+                    state = next_state
+                if state:
+                    self.best[state] = min(self.best[state], rank)
+
+        # Breadth-first so every fail target is finished before its dependents
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.best[next_state] = min(self.best[next_state], self.best[self.fail[next_state]])
+                queue.append(next_state)
+
+    def match(self, text: str) -> Optional[dict]:
+        goto, fail, best = self.goto, self.fail, self.best
+        found = len(self.intents)
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if best[state] < found:
+                found = best[state]
+                if found == 0:
+                    break
+        return self.intents[found] if found < len(self.intents) else None
+
+
+def load_intents(path: str = INTENTS_PATH) -> IntentMatcher:
+    with open(path, encoding="utf-8") as f:
+        return IntentMatcher(json.load(f))
+
+
+def benchmark_intents(rule_counts: List[int], messages: int = 2000) -> None:
+    """Compare the compiled matcher with a chain of substring scans on random rules."""
+    rng = random.Random(0)
+    alphabet = string.ascii_lowercase + "가나다라마바사아자차카타파하"
+
+    def word() -> str:
+        return "".join(rng.choice(alphabet) for _ in range(rng.randint(4, 8)))
+
+    texts = [" ".join(word() for _ in range(rng.randint(3, 12))) for _ in range(messages)]
+    for count in rule_counts:
+        intents = [
+            {"name": f"rule{i}", "priority": rng.randint(0, 100), "keywords": [word() for _ in range(3)]}
+            for i in range(count)
+        ]
+        start = time.perf_counter()
+        matcher = IntentMatcher(intents)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        compiled = [matcher.match(text) for text in texts]
+        compiled_time = time.perf_counter() - start
+
+        ranked = matcher.intents
+        start = time.perf_counter()
+        naive = [
+            next((i for i in ranked if any(k in text for k in i["keywords"])), None)
+            for text in texts
+        ]
+        naive_time = time.perf_counter() - start
+
+        assert compiled == naive
+        print(
+            f"{count:>6} rules: build {build * 1000:8.1f} ms | "
+            f"automaton {compiled_time / messages * 1e6:8.1f} us/msg | "
+            f"substring chain {naive_time / messages * 1e6:8.1f} us/msg"
+        )
+
+
+# A reply generator takes the user message and the session ID and yields reply
+# chunks; it may be a plain generator or an async generator
+ReplyGenerator = Callable[[str, str], Iterable[str]]
+
+
+def iter_reply_chunks(reply: str) -> Iterator[str]:
+    """Split a finished reply into word-sized chunks for streaming."""
+    for match in re.finditer(r"\s*\S+", reply):
+        yield match.group()
+
+
+def iter_sync(chunks) -> Iterator[str]:
+    """Iterate a sync or async iterable from a WSGI response.
+
+    Under the Flask server each open stream holds a thread; run with
+    ``--server aiohttp`` to keep idle streams on the event loop instead.
+    """
+    if not hasattr(chunks, "__anext__"):
+        yield from chunks
+        return
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(chunks.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        loop.run_until_complete(chunks.aclose())
+        loop.close()
+
+
+async def iter_async(chunks):
+    """Iterate a sync or async iterable on the event loop; sync steps run in a thread."""
+    if hasattr(chunks, "__anext__"):
+        async for chunk in chunks:
+            yield chunk
+        return
+    iterator = iter(chunks)
+    done = object()
+    while True:
+        chunk = await asyncio.to_thread(next, iterator, done)
+        if chunk is done:
+            return
+        yield chunk
+
+
+def sse_event(data: dict, event: Optional[str] = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def create_async_server(app: Flask) -> "web.Application":
+    """aiohttp front end for ``app``.
+
+    ``POST /api/chat/stream`` runs on the event loop, so an idle open stream costs a
+    coroutine rather than a thread; every other request is passed to the Flask app
+    in a worker thread. The session ID is read from (or written to) Flask's signed
+    session cookie, so both halves share the same history.
+    """
+    chat = app.extensions["chatbot"]
+    serializer = app.session_interface.get_signing_serializer(app)
+    cookie_name = app.config["SESSION_COOKIE_NAME"]
+    max_age = int(app.permanent_session_lifetime.total_seconds())
+
+    async def chat_stream(request: "web.Request") -> "web.StreamResponse":
+        try:
+            payload = await request.json()
+        except ValueError:
+            payload = {}
+        user_message = payload.get("message", "")
+        generator = chat["generators"].get(payload.get("generator", "rule"))
+        if generator is None:
+            return web.json_response({"error": "unknown generator"}, status=400)
+
+        response = web.StreamResponse(headers={
+            "Content-Type": "text/event-stream; charset=utf-8",
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        })
+        origin = request.headers.get("Origin")
+        if origin in CORS_ORIGINS:
+            response.headers["Access-Control-Allow-Origin"] = origin
+            response.headers["Access-Control-Allow-Credentials"] = "true"
+
+        try:
+            session_data = serializer.loads(request.cookies.get(cookie_name, ""), max_age=max_age)
+        except BadSignature:
+            session_data = {}
+        session_id = session_data.get("sid")
+        if session_id is None:
+            session_id = uuid.uuid4().hex
+            session_data = {"_permanent": True, "sid": session_id}
+            response.set_cookie(cookie_name, serializer.dumps(session_data),
+                                max_age=max_age, httponly=True, path="/")
+
+        await response.prepare(request)
+        parts = []
+        try:
+            # Called in a thread in case a generator does blocking work before its first chunk
+            chunks = await asyncio.to_thread(generator, user_message, session_id)
+            async for chunk in iter_async(chunks):
+                parts.append(chunk)
+                await response.write(sse_event({"delta": chunk}).encode("utf-8"))
+        except Exception as e:
+            await response.write(sse_event({"error": str(e)}, event="error").encode("utf-8"))
+            return response
+        reply = "".join(parts)
+        messages = [
+            {"role": "user", "content": user_message},
+            {"role": "assistant", "content": reply},
+        ]
+        await asyncio.to_thread(chat["store"].append, session_id, messages)
+        await response.write(sse_event({"reply": reply, "messages": messages}, event="done").encode("utf-8"))
+        await response.write_eof()
+        return response
+
+    async def wsgi_proxy(request: "web.Request") -> "web.Response":
+        body = await request.read()
+        environ = {
+            "REQUEST_METHOD": request.method,
+            "SCRIPT_NAME": "",
+            "PATH_INFO": unquote(request.raw_path.split("?", 1)[0], "latin-1"),
+            "QUERY_STRING": request.query_string,
+            "SERVER_NAME": request.url.host or "localhost",
+            "SERVER_PORT": str(request.url.port or 80),
+            "SERVER_PROTOCOL": f"HTTP/{request.version.major}.{request.version.minor}",
+            "REMOTE_ADDR": request.remote or "",
+            "CONTENT_TYPE": request.headers.get("Content-Type", ""),
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": request.scheme,
+            "wsgi.input": BytesIO(body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        for name, value in request.headers.items():
+            key = "HTTP_" + name.upper().replace("-", "_")
+            if key not in ("HTTP_CONTENT_TYPE", "HTTP_CONTENT_LENGTH"):
+                environ[key] = f"{environ[key]},{value}" if key in environ else value
+
+        started = {}
+
+        def start_response(status, headers, exc_info=None):
+            started["status"] = int(status.split(" ", 1)[0])
+            started["headers"] = headers
+
+        def call_app() -> bytes:
+            result = app(environ, start_response)
+            try:
+                return b"".join(result)
+            finally:
+                if hasattr(result, "close"):
+                    result.close()
+
+        content = await asyncio.to_thread(call_app)
+        response = web.Response(body=content, status=started["status"])
+        for name, value in started["headers"]:
+            if name.lower() not in ("content-length", "transfer-encoding"):
+                response.headers.add(name, value)
+        return response
+
+    server = web.Application()
+    server.router.add_post("/api/chat/stream", chat_stream)
+    server.router.add_route("*", "/{path:.*}", wsgi_proxy)
+    return server
+
+
+LOAD_TEST_MESSAGES = [
+    "안녕하세요",
+    "이름이 뭐예요?",
+    "오늘 날씨 어때요?",
+    "플라스크로 챗봇을 만들고 있어요",
+    "세션 기록이 잘 저장되는지 확인하는 조금 더 긴 메시지입니다. " * 3,
+]
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    # Nearest-rank percentile of an already sorted list (rounded first so that float
+    # noise such as 0.07 * 100 = 7.000000000000001 does not push the rank up by one)
+    rank = math.ceil(round(fraction * len(sorted_values), 9))
+    index = max(0, min(len(sorted_values) - 1, rank - 1))
+    return sorted_values[index]
+
+
+def run_load_test(app: Flask, sessions: int, turns: int, concurrency: int) -> Dict[str, dict]:
+    """Drive ``app`` with simulated sessions and report latency, throughput and payload size.
+
+    Each session has its own test client (and so its own cookie), loads its history,
+    sends ``turns`` chat messages while re-reading the history every few turns so it
+    grows the way a real conversation does, and finally resets.
+    """
+    samples: Dict[str, List[tuple]] = defaultdict(list)
+    lock = threading.Lock()
+
+    def simulate(session_index: int) -> None:
+        rng = random.Random(session_index)
+        client = app.test_client()
+        local: List[tuple] = []
+
+        def record(endpoint: str, send) -> None:
+            start = time.perf_counter()
+            response = send()
+            elapsed = time.perf_counter() - start
+            local.append((endpoint, elapsed, len(response.get_data())))
+
+        record("GET /api/history", lambda: client.get("/api/history"))
+        for turn in range(turns):
+            message = f"{rng.choice(LOAD_TEST_MESSAGES)} #{turn}"
+            record("POST /api/chat", lambda: client.post("/api/chat", json={"message": message}))
+            if turn % 5 == 4:
+                record("GET /api/history", lambda: client.get("/api/history"))
+        record("POST /api/reset", lambda: client.post("/api/reset"))
+
+        with lock:
+            for endpoint, elapsed, size in local:
+                samples[endpoint].append((elapsed, size))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(simulate, range(sessions)))
+    wall = time.perf_counter() - start
+
+    report = {}
+    total_requests = 0
+    print(f"{sessions} sessions x {turns} turns, concurrency {concurrency}, {wall:.2f}s")
+    print(f"{'endpoint':<18} {'count':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>8} {'avg bytes':>10}")
+    for endpoint in sorted(samples):
+        latencies = sorted(elapsed for elapsed, _ in samples[endpoint])
+        sizes = [size for _, size in samples[endpoint]]
+        total_requests += len(latencies)
+        report[endpoint] = {
+            "count": len(latencies),
+            "p50_ms": percentile(latencies, 0.50) * 1000,
+            "p95_ms": percentile(latencies, 0.95) * 1000,
+            "p99_ms": percentile(latencies, 0.99) * 1000,
+            "throughput": len(latencies) / wall,
+            "avg_bytes": sum(sizes) / len(sizes),
+        }
+        row = report[endpoint]
+        print(f"{endpoint:<18} {row['count']:>7} {row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} "
+              f"{row['p99_ms']:>8.2f} {row['throughput']:>8.1f} {row['avg_bytes']:>10.0f}")
+    print(f"total {total_requests} requests, {total_requests / wall:.1f} req/s")
+    return report
+
+
+def create_history_store() -> HistoryStore:
+    # Set CHAT_HISTORY_DB to keep history on disk across restarts
+    path = os.environ.get("CHAT_HISTORY_DB")
+    return SqliteHistoryStore(path) if path else MemoryHistoryStore()
+
+
+def create_app(
+    history_store: Optional[HistoryStore] = None,
+    intents: Optional[IntentMatcher] = None,
+    reply_generators: Optional[Dict[str, ReplyGenerator]] = None,
+) -> Flask:
     app = Flask(__name__, static_folder="static", template_folder="templates")
 
     # Secret key for session management
@@ -15,69 +504,145 @@ def create_app() -> Flask:
     # Enable CORS for development (Live Server on 127.0.0.1:5500)
     CORS(
         app,
-        resources={r"/api/*": {"origins": ["http://127.0.0.1:5500", "http://localhost:5500"]}},
+        resources={r"/api/*": {"origins": CORS_ORIGINS}},
         supports_credentials=True,
     )
 
+    # The cookie session only carries an ID; messages live in the history store
+    store = history_store or create_history_store()
+    matcher = intents or load_intents()
+
     @app.before_request
     def make_session_permanent() -> None:
         session.permanent = True
 
-    def get_history() -> list:
-        history = session.get("history")
-        if history is None:
-            history = []
-            session["history"] = history
-        return history
+    def get_session_id() -> str:
+        session_id = session.get("sid")
+        if session_id is None:
+            session_id = uuid.uuid4().hex
+            session["sid"] = session_id
+            # Drop history left in cookies by older versions
+            session.pop("history", None)
+        return session_id
 
-    def bot_reply(user_message: str) -> str:
+    def bot_reply(user_message: str, session_id: str) -> str:
         # Very simple rule-based bot for demo purposes.
         text = (user_message or "").strip().lower()
         if not text:
             return "안녕하세요! 무엇을 도와드릴까요?"
-        if any(greet in text for greet in ["안녕", "hello", "hi", "ㅎㅇ"]):
-            return "안녕하세요! 챗봇입니다. 무엇을 도와드릴까요?"
-        if "이름" in text:
-            return "저는 간단한 플라스크 챗봇이에요."
-        if "지워" in text or "초기화" in text or "reset" in text:
-            session["history"] = []
-            return "대화 기록을 초기화했어요."
+        # Keyword intents come from intents.json, matched in a single pass
+        intent = matcher.match(text)
+        if intent is not None:
+            if intent.get("action") == "reset":
+                store.clear(session_id)
+            return intent["reply"]
         return f"방금 하신 말씀은 이렇게 이해했어요: '{user_message}'. 더 자세히 알려주실래요?"
 
+    def rule_reply(user_message: str, session_id: str) -> Iterator[str]:
+        # A generator function, so bot_reply (and a reset's store.clear) runs on the first
+        # step, which iter_async takes in a worker thread rather than on the event loop
+        yield from iter_reply_chunks(bot_reply(user_message, session_id))
+
+    # Generators selectable by name in /api/chat/stream; "rule" streams bot_reply
+    generators: Dict[str, ReplyGenerator] = {"rule": rule_reply}
+    generators.update(reply_generators or {})
+    # Shared with the aiohttp front end (create_async_server)
+    app.extensions["chatbot"] = {"store": store, "generators": generators}
+
     @app.get("/")
     def index():
         return render_template("index.html")
 
     @app.get("/api/history")
     def api_history():
-        return jsonify({"history": get_history()})
+        return jsonify({"history": store.get(get_session_id())})
 
     @app.post("/api/chat")
     def api_chat():
         payload = request.get_json(silent=True) or {}
         user_message = payload.get("message", "")
 
-        history = get_history()
-        history.append({"role": "user", "content": user_message})
+        session_id = get_session_id()
+        reply = bot_reply(user_message, session_id)
+        # Only the new messages go back to the client; /api/history has the rest
+        messages = [
+            {"role": "user", "content": user_message},
+            {"role": "assistant", "content": reply},
+        ]
+        store.append(session_id, messages)
 
-        reply = bot_reply(user_message)
-        history.append({"role": "assistant", "content": reply})
+        return jsonify({"reply": reply, "messages": messages})
 
-        session["history"] = history
+    @app.post("/api/chat/stream")
+    def api_chat_stream():
+        """Stream the reply as Server-Sent Events: one ``delta`` event per chunk, then ``done``."""
+        payload = request.get_json(silent=True) or {}
+        user_message = payload.get("message", "")
+        generator = generators.get(payload.get("generator", "rule"))
+        if generator is None:
+            return jsonify({"error": "unknown generator"}), 400
 
-        return jsonify({"reply": reply, "history": history})
+        # Set the session cookie before the body starts streaming
+        session_id = get_session_id()
+
+        def events():
+            parts = []
+            try:
+                for chunk in iter_sync(generator(user_message, session_id)):
+                    parts.append(chunk)
+                    yield sse_event({"delta": chunk})
+            except Exception as e:
+                yield sse_event({"error": str(e)}, event="error")
+                return
+            reply = "".join(parts)
+            messages = [
+                {"role": "user", "content": user_message},
+                {"role": "assistant", "content": reply},
+            ]
+            store.append(session_id, messages)
+            yield sse_event({"reply": reply, "messages": messages}, event="done")
+
+        headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        return Response(stream_with_context(events()), mimetype="text/event-stream", headers=headers)
 
     @app.post("/api/reset")
     def api_reset():
-        session["history"] = []
+        store.clear(get_session_id())
         return jsonify({"ok": True})
 
     return app
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="간단한 플라스크 챗봇")
+    parser.add_argument("--benchmark-intents", action="store_true",
+                        help="Benchmark the intent matcher with thousands of random rules and exit")
+    parser.add_argument("--rules", type=int, nargs="+", default=[10, 100, 1000, 5000],
+                        help="Rule counts for --benchmark-intents")
+    parser.add_argument("--load-test", action="store_true",
+                        help="Run the built-in load generator against create_app() and exit")
+    parser.add_argument("--sessions", type=int, default=200, help="Simulated sessions for --load-test")
+    parser.add_argument("--turns", type=int, default=20, help="Chat messages per session for --load-test")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent sessions for --load-test")
+    parser.add_argument("--server", choices=["flask", "aiohttp"], default="flask",
+                        help="aiohttp keeps idle streaming connections on an event loop instead of threads")
+    args = parser.parse_args()
+
+    if args.benchmark_intents:
+        benchmark_intents(args.rules)
+        raise SystemExit(0)
+
+    if args.load_test:
+        run_load_test(create_app(), args.sessions, args.turns, args.concurrency)
+        raise SystemExit(0)
+
     port = int(os.environ.get("PORT", 5000))
     app = create_app()
-    app.run(host="0.0.0.0", port=port, debug=True)
+    if args.server == "aiohttp":
+        if not AIOHTTP_AVAILABLE:
+            parser.error("aiohttp is not installed (pip install aiohttp)")
+        web.run_app(create_async_server(app), host="0.0.0.0", port=port)
+    else:
+        app.run(host="0.0.0.0", port=port, debug=True)
 
 
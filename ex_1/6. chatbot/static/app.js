@@ -24,25 +24,58 @@ async function loadHistory() {
   }
 }
 
+function lastAssistant() {
+  const nodes = chatEl.querySelectorAll('.msg.assistant');
+  return nodes[nodes.length - 1];
+}
+
+// Read Server-Sent Events from a fetch response body (EventSource only supports GET)
+async function* readEvents(res) {
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    let sep;
+    while ((sep = buffer.indexOf('\n\n')) !== -1) {
+      const block = buffer.slice(0, sep);
+      buffer = buffer.slice(sep + 2);
+      let event = 'message';
+      let data = '';
+      for (const line of block.split('\n')) {
+        if (line.startsWith('event: ')) event = line.slice(7);
+        else if (line.startsWith('data: ')) data += line.slice(6);
+      }
+      if (data) yield { event, data: JSON.parse(data) };
+    }
+  }
+}
+
 async function sendMessage(text) {
   renderMessage('user', text);
   renderMessage('assistant', '...');
+  const target = lastAssistant();
   try {
-    const res = await fetch(`${API_BASE}/api/chat`, {
+    const res = await fetch(`${API_BASE}/api/chat/stream`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
       credentials: 'include',
       body: JSON.stringify({ message: text })
     });
-    const data = await res.json();
-    // Replace the last assistant placeholder with actual reply
-    const nodes = chatEl.querySelectorAll('.msg.assistant');
-    const last = nodes[nodes.length - 1];
-    if (last) last.textContent = data.reply;
+    if (!res.ok || !res.body) throw new Error(`HTTP ${res.status}`);
+    let reply = '';
+    for await (const { event, data } of readEvents(res)) {
+      if (event === 'error') throw new Error(data.error);
+      // Show each chunk as soon as it arrives
+      if (data.delta !== undefined) reply += data.delta;
+      if (event === 'done') reply = data.reply;
+      target.textContent = reply;
+      chatEl.scrollTop = chatEl.scrollHeight;
+    }
   } catch (e) {
-    const nodes = chatEl.querySelectorAll('.msg.assistant');
-    const last = nodes[nodes.length - 1];
-    if (last) last.textContent = '오류가 발생했어요. 다시 시도해주세요.';
+    target.textContent = '오류가 발생했어요. 다시 시도해주세요.';
   }
 }
 
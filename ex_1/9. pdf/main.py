@@ -1,6 +1,10 @@
 import io
+import os
+import pickle
 import re
-from typing import List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator, List, Optional, Tuple
 
 import streamlit as st
 from pypdf import PdfReader
@@ -11,21 +15,90 @@ from deep_translator import GoogleTranslator
 DetectorFactory.seed = 0
 
 
+# Documents with fewer pages than this are extracted in-process; pool startup would dominate
+PARALLEL_MIN_PAGES = 32
+PAGES_PER_SHARD = 16
+
+# Per-worker reader, opened once by _init_worker
+_worker_reader: Optional[PdfReader] = None
+
+
+def _extract_page(reader: PdfReader, index: int) -> str:
+	try:
+		return reader.pages[index].extract_text() or ""
+	except Exception:
+		# Pages that fail to extract count as empty
+		return ""
+
+
+def _init_worker(file_bytes: bytes) -> None:
+	"""Open this worker's own PdfReader over the PDF bytes (sent once per process)."""
+	global _worker_reader
+	_worker_reader = PdfReader(io.BytesIO(file_bytes))
+
+
+def _extract_shard(page_range: Tuple[int, int]) -> List[str]:
+	start, end = page_range
+	return [_extract_page(_worker_reader, index) for index in range(start, end)]
+
+
+def pdf_page_count(file_bytes: bytes) -> int:
+	try:
+		return len(PdfReader(io.BytesIO(file_bytes)).pages)
+	except Exception:
+		return 0
+
+
+def iter_pdf_pages(
+	file_bytes: bytes,
+	workers: Optional[int] = None,
+	pages_per_shard: int = PAGES_PER_SHARD,
+) -> Iterator[str]:
+	"""Yield the text of each page in page order.
+
+	Page ranges of ``pages_per_shard`` pages are extracted in a process pool, and
+	each shard is yielded as soon as it and every earlier shard are done, so callers
+	can start using the text before the whole document is extracted. If the pool
+	cannot be used, the remaining pages are extracted in this process.
+	"""
+	reader = PdfReader(io.BytesIO(file_bytes))
+	page_count = len(reader.pages)
+	workers = workers or os.cpu_count() or 1
+	next_page = 0
+
+	if workers > 1 and page_count >= PARALLEL_MIN_PAGES:
+		shards = [
+			(start, min(start + pages_per_shard, page_count))
+			for start in range(0, page_count, pages_per_shard)
+		]
+		executor = ProcessPoolExecutor(
+			max_workers=min(workers, len(shards)),
+			initializer=_init_worker,
+			initargs=(file_bytes,),
+		)
+		try:
+			for texts in executor.map(_extract_shard, shards):
+				for text in texts:
+					next_page += 1
+					yield text
+		except (BrokenProcessPool, pickle.PicklingError, AttributeError):
+			# e.g. worker functions not importable when run through `streamlit run` on spawn platforms
+			pass
+		finally:
+			executor.shutdown(wait=False, cancel_futures=True)
+
+	for index in range(next_page, page_count):
+		yield _extract_page(reader, index)
+
+
 def extract_text_from_pdf(file_bytes: bytes) -> str:
 	"""Extract text from a PDF file given as bytes using pypdf.
 
+	Pages are extracted in parallel for large documents (see iter_pdf_pages).
 	Returns an empty string if no text is found or on failure.
 	"""
 	try:
-		reader = PdfReader(io.BytesIO(file_bytes))
-		texts: List[str] = []
-		for page in reader.pages:
-			try:
-				texts.append(page.extract_text() or "")
-			except Exception:
-				# Skip pages that fail to extract
-				continue
-		return "\n".join(t.strip() for t in texts if t)
+		return "\n".join(t.strip() for t in iter_pdf_pages(file_bytes) if t)
 	except Exception:
 		return ""
 
@@ -198,8 +271,26 @@ def main() -> None:
 
 	# Read bytes first (works for large files as well; Streamlit provides a buffer)
 	file_bytes = uploaded.read()
-	with st.spinner("PDF에서 텍스트 추출 중..."):
-		text = extract_text_from_pdf(file_bytes)
+	page_count = pdf_page_count(file_bytes)
+	progress = st.progress(0.0, text="PDF에서 텍스트 추출 중...")
+	running_stats = st.empty()
+	# Pages arrive in order while extraction continues in the background workers
+	page_texts: List[str] = []
+	running_chars = running_words = 0
+	try:
+		for index, page_text in enumerate(iter_pdf_pages(file_bytes), start=1):
+			page_text = page_text.strip()
+			if page_text:
+				page_texts.append(page_text)
+				running_chars += len(page_text)
+				running_words += len(tokenize_words(page_text))
+			progress.progress(index / max(page_count, 1), text=f"PDF에서 텍스트 추출 중... ({index}/{page_count} 페이지)")
+			running_stats.caption(f"지금까지 문자 {running_chars:,}, 단어 {running_words:,}")
+	except Exception:
+		page_texts = []
+	progress.empty()
+	running_stats.empty()
+	text = "\n".join(page_texts)
 
 	if not text or len(text.strip()) == 0:
 		st.error("텍스트를 추출할 수 없습니다. 스캔본(PDF 이미지)일 수 있습니다. 텍스트 기반 PDF를 사용해 주세요.")